@@ -0,0 +1,169 @@
+import argparse
+
+
+class LinearComplexity:
+    """
+    Berlekamp-Massey算法的流式实现: 逐位输入序列, 随时给出当前的线性复杂度和最短LFSR
+
+    序列位打包保存在 bytearray 中(每位1比特), 另外维护一个整数窗口 R,
+    其第i位是倒数第 i+1 个输入位, 于是差值 d = Σ c_i s_(n-i) 就是 (C & R) 的奇偶性,
+    一次整数与运算代替逐位循环.
+    """
+
+    def __init__(self):
+        self.connection = 1     # 连接多项式 C(x), 第i位是 x^i 的系数
+        self._prev = 1          # 上一次长度改变前的连接多项式 B(x)
+        self._shift = 1         # 距上一次长度改变的步数
+        self.linear_complexity = 0
+        self.length = 0
+        self._bits = bytearray()
+        self._window = 0
+        self._window_bits = 64
+
+    def update(self, bit):
+        """输入一个序列位, 返回输入后的线性复杂度"""
+        n = self.length
+        if n % 8 == 0:
+            self._bits.append(0)
+        if bit:
+            self._bits[n >> 3] |= 0x80 >> (n & 7)
+        self.length += 1
+        self._window = ((self._window << 1) | bit) & ((1 << self._window_bits) - 1)
+
+        L = self.linear_complexity
+        if (self.connection & self._window).bit_count() & 1:
+            previous = self.connection
+            self.connection ^= self._prev << self._shift
+            if 2 * L <= n:
+                L = self.linear_complexity = n + 1 - L
+                self._prev = previous
+                self._shift = 1
+                if L >= self._window_bits:
+                    # 窗口不够长时从打包的序列中重建, 长度加倍使重建的总代价为线性
+                    self._window_bits = 2 * (L + 1)
+                    self._window = self._recent_bits(self._window_bits)
+            else:
+                self._shift += 1
+        else:
+            self._shift += 1
+        return L
+
+    def _recent_bits(self, count):
+        """取最近 count 个输入位, 第i位是倒数第 i+1 个输入位"""
+        n = self.length
+        start = max(n - count, 0) >> 3
+        end = (n + 7) >> 3
+        value = int.from_bytes(self._bits[start:end], 'big') >> (end * 8 - n)
+        return value & ((1 << count) - 1)
+
+    def feed(self, bits):
+        """输入一段序列位, 返回最终的线性复杂度"""
+        for bit in bits:
+            self.update(bit)
+        return self.linear_complexity
+
+    def taps(self):
+        """当前最短LFSR的抽头位置(从1开始计数, 与 LFSR 构造函数相同)"""
+        return [i for i in range(1, self.linear_complexity + 1) if self.connection >> i & 1]
+
+    def initial_state(self):
+        """当前最短LFSR的初态, 第p位对应序列的第 L-1-p 位(LFSR 从 state[-1] 输出)"""
+        L = self.linear_complexity
+        head = int.from_bytes(self._bits[:(L + 7) >> 3], 'big') >> (-L % 8)
+        return [(head >> p) & 1 for p in range(L)]
+
+    def lfsr_parameters(self):
+        """返回 (degree, taps, initial_state), 可直接传给 LFSR(degree, taps, initial_state)"""
+        return self.linear_complexity, self.taps(), self.initial_state()
+
+
+def iter_bits(source, packed=False):
+    """
+    把各种形式的输入展开为逐位的迭代器
+
+    source 可以是:
+        0/1 列表等可迭代对象;
+        bytes/bytearray, 按每字节高位在前展开(与 LFSR.generate_bytes 一致);
+        文件名, packed=True 时按二进制打包文件读取, 否则读取 LFSR.py 打印的结果
+        (取最后一行只由0和1组成的内容)
+    """
+    if isinstance(source, str):
+        if packed:
+            return _iter_packed_file(source)
+        return iter(read_sequence_file(source))
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _iter_packed_bytes(source)
+    return iter(source)
+
+
+def _iter_packed_bytes(data):
+    for byte in data:
+        for k in range(7, -1, -1):
+            yield (byte >> k) & 1
+
+
+def _iter_packed_file(filename, chunk_size=1 << 16):
+    with open(filename, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield from _iter_packed_bytes(chunk)
+
+
+def read_sequence_file(filename):
+    """读取 LFSR.py 打印的输出(或只含0/1序列的文本文件), 返回序列位列表"""
+    sequence = ''
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip().replace(' ', '')
+            if line and set(line) <= {'0', '1'}:
+                sequence = line
+    if not sequence:
+        raise ValueError("文件中没有找到0/1序列")
+    return list(map(int, sequence))
+
+
+def berlekamp_massey(source, packed=False):
+    """
+    求生成给定序列的最短LFSR
+
+    返回 (degree, taps, initial_state), 形式与 LFSR 构造函数的参数相同;
+    全0序列的线性复杂度为0, 返回 (0, [], []).
+    """
+    lc = LinearComplexity()
+    lc.feed(iter_bits(source, packed))
+    return lc.lfsr_parameters()
+
+
+def linear_complexity_profile(source, packed=False):
+    """流式计算线性复杂度轮廓, 依次产生前 1, 2, 3, ... 位序列的线性复杂度"""
+    lc = LinearComplexity()
+    for bit in iter_bits(source, packed):
+        yield lc.update(bit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Berlekamp-Massey算法: 由序列综合最短LFSR")
+    parser.add_argument("sequence_file", help="LFSR.py 的输出文件, 或打包的二进制序列文件")
+    parser.add_argument("--packed", action="store_true", help="按二进制打包格式读取序列")
+    parser.add_argument("--profile", action="store_true", help="输出线性复杂度轮廓(复杂度变化处)")
+    args = parser.parse_args()
+
+    lc = LinearComplexity()
+    last = 0
+    for bit in iter_bits(args.sequence_file, args.packed):
+        L = lc.update(bit)
+        if args.profile and L != last:
+            print(f"n = {lc.length}: L = {L}")
+            last = L
+
+    degree, taps, initial_state = lc.lfsr_parameters()
+    print(f"序列长度: {lc.length}")
+    print(f"线性复杂度(级数): {degree}")
+    print(f"抽头系数: {taps}")
+    print(f"初态: {initial_state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
+import argparse
+import sys
+
+
 class LFSR:
     def __init__(self, degree, taps, initial_state):
         """
@@ -11,6 +15,7 @@ class LFSR:
         self.degree = degree
         self.taps = taps
         self.state = initial_state.copy()
+        self._initial_state = initial_state.copy()
 
         # 验证参数
         if len(self.state) != self.degree:
@@ -20,6 +25,12 @@ class LFSR:
         if any(tap < 1 or tap > self.degree for tap in self.taps):
             raise ValueError("抽头位置必须在1到级数范围内")
 
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.next_bit()
+
     def next_bit(self):
         """生成下一个比特并更新状态"""
         # 计算反馈位(XOR所有抽头位置的位)
@@ -42,6 +53,242 @@ class LFSR:
             sequence.append(self.next_bit())
         return sequence
 
+    def generate_bytes(self, n):
+        """生成 n 个字节(8n 位)的输出, 每个字节高位在前"""
+        return bytes(self._generate(8 * n))
+
+    def iter_bytes(self, chunk_size=1 << 16, total=None):
+        """
+        按块产生打包的输出, 每块 chunk_size 字节
+
+        total 为总字节数, None 表示无限产生; 每块生成后即可丢弃, 内存占用与总长度无关.
+        """
+        remaining = total
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            yield self.generate_bytes(size)
+            if remaining is not None:
+                remaining -= size
+
+    def readinto(self, buffer):
+        """用输出填满可写缓冲区(如 bytearray), 返回写入的字节数, 便于重复使用同一块缓冲区"""
+        view = memoryview(buffer).cast('B')
+        view[:] = self._generate(8 * len(view))
+        return len(view)
+
+    def generate_packed(self, length):
+        """生成 length 位输出, 打包为 NumPy uint8 数组(与 np.packbits 一致, 末字节低位补0)"""
+        import numpy as np
+        return np.frombuffer(self._generate(length), dtype=np.uint8).copy()
+
+    def jump(self, n):
+        """
+        把状态向前推进 n 步(等价于丢弃 n 个输出位), 复杂度 O(degree² log n)
+
+        输出序列满足特征多项式 P(x) = x^d + Σ x^(d-tap), 先求 x^n mod P(x) = Σ c_k x^k,
+        则 a_(n+i) = Σ c_k a_(k+i), 只需要当前状态之后的 2d-1 个序列位.
+        """
+        if n < 0:
+            raise ValueError("跳跃步数不能为负")
+        d = self.degree
+        poly = 1 << d
+        for tap in self.taps:
+            poly ^= 1 << (d - tap)
+        r = _gf2_pow_x(n, poly)
+
+        # 第k位是当前状态之后的第k个输出位 a_k
+        seq = 0
+        for k, bit in enumerate(reversed(self.state)):
+            seq |= bit << k
+        for k in range(d, 2 * d - 1):
+            feedback = 0
+            for tap in self.taps:
+                feedback ^= (seq >> (k - tap)) & 1
+            seq |= feedback << k
+
+        self.state = [(r & (seq >> (d - 1 - p))).bit_count() & 1 for p in range(d)]
+        return self
+
+    def seek(self, n):
+        """把状态定位到从初态开始的第 n 个输出位处(下一次输出即序列的第 n 位, 从0计数)"""
+        self.state = self._initial_state.copy()
+        return self.jump(n)
+
+    def _generate(self, nbits):
+        """逐位生成 nbits 位输出并按高位在前打包为字节(参考实现)"""
+        sequence = self.generate_sequence(nbits) + [0] * (-nbits % 8)
+        return bytes(int(''.join(map(str, sequence[i:i + 8])), 2)
+                     for i in range(0, len(sequence), 8))
+
+
+class PackedLFSR(LFSR):
+    """
+    位打包的LFSR引擎, 输出与 LFSR.generate_sequence 逐位一致
+
+    状态保存为一个整数, 第p位对应 state[p], 所以下一个输出位是第 degree-1 位.
+    GF(2) 上 C(x)^(2^j) = C(x^(2^j)), 输出序列同样满足抽头放大 2^j 倍后的递推,
+    放大到最小抽头不小于字长后, 每次迭代只需几次移位和异或就能算出整整一个字.
+    """
+
+    def __init__(self, degree, taps, initial_state, word_bits=64):
+        """
+        参数:
+            degree, taps, initial_state: 同 LFSR
+            word_bits (int): 每次迭代生成的位数, 必须是8的正整数倍(默认64)
+        """
+        if word_bits <= 0 or word_bits % 8:
+            raise ValueError("字长必须是8的正整数倍")
+        self.word_bits = word_bits
+        super().__init__(degree, taps, initial_state)
+
+        # 出现偶数次的抽头互相抵消, 只保留奇数次的
+        self._tap_mask = 0
+        for tap in self.taps:
+            self._tap_mask ^= 1 << (tap - 1)
+        self._taps = [tap for tap in range(1, degree + 1) if self._tap_mask >> (tap - 1) & 1]
+        self._state_mask = (1 << degree) - 1
+
+    @classmethod
+    def from_lfsr(cls, lfsr, word_bits=64):
+        """由已有的 LFSR 对象(按其当前状态)构造位打包引擎"""
+        return cls(lfsr.degree, lfsr.taps, lfsr.state, word_bits)
+
+    @property
+    def state(self):
+        return [(self._reg >> p) & 1 for p in range(self.degree)]
+
+    @state.setter
+    def state(self, bits):
+        if len(bits) != self.degree or any(x not in {0, 1} for x in bits):
+            raise ValueError("状态必须是长度等于级数的0/1序列")
+        self._reg = sum(bit << p for p, bit in enumerate(bits))
+
+    def next_bit(self):
+        """生成下一个比特并更新状态"""
+        output = self._reg >> (self.degree - 1)
+        feedback = (self._reg & self._tap_mask).bit_count() & 1
+        self._reg = ((self._reg << 1) | feedback) & self._state_mask
+        return output
+
+    def generate_sequence(self, length):
+        """生成指定长度的输出序列"""
+        data = self._generate(length)
+        bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b')
+        return list(map(int, bits[:length]))
+
+    def _generate(self, nbits):
+        """
+        生成 nbits 位输出并按高位在前打包为字节, 同时把状态前进 nbits 步
+
+        窗口整数 w 的第p位是目前已知的倒数第 p+1 个序列位, 所以抽头t对应第 t-1 位;
+        除了输出的 nbits 位, 还要多算出 degree 位作为新的状态.
+        """
+        d = self.degree
+        need = nbits + d
+        taps = self._taps
+        w, length = self._reg, d
+
+        # 逐级把抽头放大一倍, 每级把窗口扩展到两倍长, 直到最小抽头不小于字长
+        scale = 1
+        while length < need and taps and (scale * taps[0] < self.word_bits or scale < 8):
+            m = scale * taps[0]
+            target = min(need, 2 * length)
+            while length < target:
+                step = min(m, target - length)
+                chunk = 0
+                for tap in taps:
+                    chunk ^= w >> (tap * scale - step)
+                w = (w << step) | (chunk & ((1 << step) - 1))
+                length += step
+            scale *= 2
+        if not taps and length < need:
+            # 没有有效抽头时反馈恒为0
+            w <<= need - length
+            length = need
+
+        if length >= need:
+            self._reg = (w >> (length - need)) & self._state_mask
+            pad = -nbits % 8
+            return ((w >> (length - nbits)) << pad).to_bytes((nbits + pad) // 8, 'big')
+
+        # 字并行阶段: 窗口长 d*scale 位(8的倍数), 每次迭代生成 word_bits 位
+        word_bits = self.word_bits
+        word_bytes = word_bits // 8
+        word_mask = (1 << word_bits) - 1
+        window_mask = (1 << length) - 1
+        shifts = [tap * scale - word_bits for tap in taps]
+        stream = bytearray(w.to_bytes(length // 8, 'big'))
+        while length < need:
+            chunk = 0
+            for shift in shifts:
+                chunk ^= w >> shift
+            chunk &= word_mask
+            w = ((w << word_bits) | chunk) & window_mask
+            stream += chunk.to_bytes(word_bytes, 'big')
+            length += word_bits
+
+        # 新状态是输出之后紧接着的 d 位
+        start = nbits // 8
+        tail = stream[start:(need + 7) // 8]
+        self._reg = (int.from_bytes(tail, 'big') >> (len(tail) * 8 - (need - start * 8))) & self._state_mask
+
+        del stream[(nbits + 7) // 8:]
+        if nbits % 8:
+            stream[-1] &= (0xFF << (8 - nbits % 8)) & 0xFF
+        return stream
+
+
+def _gf2_mulmod(a, b, poly):
+    """GF(2)[x] 上计算 a*b mod poly(多项式以整数表示, 第i位是 x^i 的系数)"""
+    deg = poly.bit_length() - 1
+    product = 0
+    while b:
+        if b & 1:
+            product ^= a
+        a <<= 1
+        b >>= 1
+    while product.bit_length() > deg:
+        product ^= poly << (product.bit_length() - 1 - deg)
+    return product
+
+
+def _gf2_pow_x(n, poly):
+    """GF(2)[x] 上计算 x^n mod poly(平方-乘算法, 乘x只需移位)"""
+    deg = poly.bit_length() - 1
+    result = 1 if deg > 0 else 0
+    for bit in bin(n)[2:]:
+        result = _gf2_mulmod(result, result, poly)
+        if bit == '1':
+            result <<= 1
+            if result >> deg & 1:
+                result ^= poly
+    return result
+
+
+def _generate_chunk(args):
+    """进程池任务: 把状态跳到 offset 位之后, 生成 nbytes 个字节"""
+    degree, taps, state, offset, nbytes = args
+    lfsr = PackedLFSR(degree, taps, state)
+    lfsr.jump(offset)
+    return lfsr.generate_bytes(nbytes)
+
+
+def parallel_generate_bytes(lfsr, n, workers=None, chunk_bytes=1 << 20):
+    """
+    用进程池并行生成 lfsr 接下来的 n 个字节输出, 结果与 lfsr.generate_bytes(n) 相同
+
+    输出按 chunk_bytes 分块, 每个工作进程拿到当前状态的副本并自行跳到块的起点,
+    各块按顺序拼接. 返回后 lfsr 的状态前进 8n 步.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [(lfsr.degree, lfsr.taps, lfsr.state, 8 * start, min(chunk_bytes, n - start))
+             for start in range(0, n, chunk_bytes)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        data = b''.join(executor.map(_generate_chunk, tasks))
+    lfsr.jump(8 * n)
+    return data
+
 
 def read_config_file(filename):
     """从配置文件中读取LFSR参数"""
@@ -57,19 +304,60 @@ def read_config_file(filename):
     return degree, taps, initial_state, output_length
 
 
+def write_keystream(lfsr, length, out, chunk_size=1 << 20):
+    """
+    把 length 位打包的密钥流写入二进制文件对象 out(末字节低位补0)
+
+    所有输出都经由同一块 chunk_size 字节的缓冲区, 内存占用与 length 无关.
+    """
+    buffer = bytearray(chunk_size)
+    remaining = length // 8
+    while remaining:
+        size = min(chunk_size, remaining)
+        view = memoryview(buffer)[:size]
+        lfsr.readinto(view)
+        out.write(view)
+        remaining -= size
+    if length % 8:
+        out.write(lfsr._generate(length % 8))
+
+
+def print_sequence(lfsr, length, chunk_size=1 << 16):
+    """按块把 length 位输出以0/1字符打印到标准输出, 不在内存中拼接整个序列"""
+    remaining = length
+    while remaining:
+        size = min(8 * chunk_size, remaining)
+        data = lfsr._generate(size)
+        sys.stdout.write(format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b')[:size])
+        remaining -= size
+    sys.stdout.write('\n')
+
+
 def main():
-    # 配置文件示例 (也可以从命令行参数获取)
-    config_file = "LFSR"
+    parser = argparse.ArgumentParser(description="LFSR序列生成")
+    parser.add_argument("config_file", nargs="?", default="LFSR", help="配置文件(默认 LFSR)")
+    parser.add_argument("-o", "--output", help="把打包的密钥流写入文件('-' 表示标准输出), 不再打印序列")
+    parser.add_argument("-n", "--length", type=int, help="输出位数(默认取配置文件中的长度)")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="输出缓冲区大小(字节)")
+    args = parser.parse_args()
 
     try:
         # 读取配置文件
-        degree, taps, initial_state, output_length = read_config_file(config_file)
+        degree, taps, initial_state, output_length = read_config_file(args.config_file)
+        if args.length is not None:
+            output_length = args.length
 
         # 初始化LFSR
-        lfsr = LFSR(degree, taps, initial_state)
+        lfsr = PackedLFSR(degree, taps, initial_state)
 
-        # 生成序列
-        sequence = lfsr.generate_sequence(output_length)
+        if args.output:
+            if args.output == '-':
+                write_keystream(lfsr, output_length, sys.stdout.buffer, args.chunk_size)
+                sys.stdout.buffer.flush()
+            else:
+                with open(args.output, 'wb') as f:
+                    write_keystream(lfsr, output_length, f, args.chunk_size)
+            return
 
         # 打印结果
         print("LFSR参数:")
@@ -77,7 +365,7 @@ def main():
         print(f"抽头系数: {taps}")
         print(f"初态: {initial_state}")
         print(f"\n生成的序列 (长度={output_length}):")
-        print(''.join(map(str, sequence)))
+        print_sequence(lfsr, output_length)
 
     except Exception as e:
         print(f"错误: {e}")
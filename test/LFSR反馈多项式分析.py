@@ -0,0 +1,475 @@
+import argparse
+import itertools
+import math
+import os
+import random
+from functools import lru_cache
+
+import sympy
+
+from LFSR import read_config_file
+
+# GF(2) 上的多项式用 Python 整数表示, 第i位是 x^i 的系数, 例如 1 + x + x^4 = 0b10011.
+# LFSR 的反馈(连接)多项式取 C(x) = 1 + Σ x^tap, 输出序列满足 a_k = Σ a_(k-tap).
+
+
+def poly_to_str(poly):
+    """把多项式整数转换成可读的字符串, 如 x^4 + x + 1"""
+    if poly == 0:
+        return "0"
+    terms = []
+    for i in range(poly.bit_length() - 1, -1, -1):
+        if poly >> i & 1:
+            terms.append("1" if i == 0 else "x" if i == 1 else f"x^{i}")
+    return " + ".join(terms)
+
+
+def feedback_polynomial(degree, taps):
+    """由 LFSR 的抽头得到反馈多项式 C(x) = 1 + Σ x^tap(重复的抽头互相抵消)"""
+    poly = 1
+    for tap in taps:
+        if tap < 1 or tap > degree:
+            raise ValueError("抽头位置必须在1到级数范围内")
+        poly ^= 1 << tap
+    return poly
+
+
+def _degree(poly):
+    return poly.bit_length() - 1
+
+
+def _mul(a, b):
+    """无进位乘法(GF(2)[x] 上的乘法), 按较稀疏的一方逐项移位异或"""
+    if a.bit_count() > b.bit_count():
+        a, b = b, a
+    result = 0
+    while a:
+        low = a & -a
+        result ^= b << (low.bit_length() - 1)
+        a ^= low
+    return result
+
+
+def _sqr(a):
+    """GF(2)[x] 上平方就是把系数间隔展开: (Σ a_i x^i)² = Σ a_i x^(2i)"""
+    return int('0'.join(bin(a)[2:]), 2) if a else 0
+
+
+def _sqrt(a):
+    """平方的逆运算(要求只有偶数次项)"""
+    return int(bin(a)[2:][::-1][::2][::-1], 2) if a else 0
+
+
+def _divmod(a, b):
+    db = _degree(b)
+    quotient = 0
+    while (da := _degree(a)) >= db:
+        quotient ^= 1 << (da - db)
+        a ^= b << (da - db)
+    return quotient, a
+
+
+def _gcd(a, b):
+    while b:
+        a, b = b, _divmod(a, b)[1]
+    return a
+
+
+def _derivative(a):
+    """形式导数: 特征2下只有奇数次项留下"""
+    return (a & int('10' * ((a.bit_length() + 1) // 2), 2)) >> 1 if a > 1 else 0
+
+
+class _Modulus:
+    """
+    固定模多项式 f 下的约化与幂运算
+
+    f 很稀疏且次高项离首项较远时, 用 x^n ≡ tail 整段折叠约化;
+    否则查表每次消去最高的8位, 表项 table[t] 是 f 的倍数且最高8位恰为 t.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.n = n = _degree(f)
+        tail = f ^ (1 << n)
+        self._shifts = [i for i in range(n) if tail >> i & 1]
+        gap = n - _degree(tail) if tail else n
+        self._fold = gap > 2 * (1 + 2 * len(self._shifts))
+        self._mask = (1 << n) - 1
+        if not self._fold:
+            base = []
+            for i in range(8):
+                m = 1 << (n + i)
+                r = m
+                while (length := r.bit_length()) > n:
+                    r ^= f << (length - 1 - n)
+                base.append(m ^ r)
+            self._table = [0] * 256
+            for t in range(1, 256):
+                low = t & -t
+                self._table[t] = self._table[t ^ low] ^ base[low.bit_length() - 1]
+
+    def reduce(self, a):
+        n = self.n
+        if self._fold:
+            while a >> n:
+                high = a >> n
+                a &= self._mask
+                for shift in self._shifts:
+                    a ^= high << shift
+            return a
+        table = self._table
+        while a >> n:
+            shift = max(a.bit_length() - n - 8, 0)
+            a ^= table[a >> (n + shift)] << shift
+        return a
+
+    def mul(self, a, b):
+        return self.reduce(_mul(a, b))
+
+    def sqr(self, a):
+        return self.reduce(_sqr(a))
+
+    def pow_x(self, e):
+        """x^e mod f: 平方-乘算法, 底数是x, 乘法只是移位"""
+        result = self.reduce(1)
+        for bit in bin(e)[2:]:
+            result = self.sqr(result)
+            if bit == '1':
+                result <<= 1
+                if result >> self.n:
+                    result ^= self.f
+        return result
+
+    def pow(self, a, e):
+        result = self.reduce(1)
+        a = self.reduce(a)
+        for bit in bin(e)[2:]:
+            result = self.sqr(result)
+            if bit == '1':
+                result = self.mul(result, a)
+        return result
+
+
+def is_irreducible(poly):
+    """Rabin 不可约判定: x^(2^n) ≡ x 且对 n 的每个素因子 q, gcd(x^(2^(n/q)) - x, f) = 1"""
+    n = _degree(poly)
+    if n <= 0:
+        return False
+    if n == 1:
+        return True
+    if not poly & 1:
+        return False
+    mod = _Modulus(poly)
+    checkpoints = {n // q for q in sympy.primefactors(n)}
+    h = 2
+    for i in range(1, n + 1):
+        h = mod.sqr(h)
+        if i in checkpoints and _gcd(poly, h ^ 2) != 1:
+            return False
+    return h == 2
+
+
+def _mobius(n):
+    factors = sympy.factorint(n)
+    if any(e > 1 for e in factors.values()):
+        return 0
+    return -1 if len(factors) % 2 else 1
+
+
+# 预先分解好的 Φ_k(2) 素因子表(k ≤ 800, 数据取自Cunningham表), 表中没有的 k 才在运行时用 factorint 分解
+CYCLOTOMIC_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mersenne_factors')
+
+
+@lru_cache(maxsize=None)
+def _cyclotomic_table():
+    """读取 CYCLOTOMIC_TABLE, 返回 {k: Φ_k(2) 的素因子列表}; 文件不存在时返回空表"""
+    table = {}
+    try:
+        with open(CYCLOTOMIC_TABLE, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                k, _, factors = line.partition(':')
+                table[int(k)] = [int(q) for q in factors.split()]
+    except FileNotFoundError:
+        pass
+    return table
+
+
+@lru_cache(maxsize=None)
+def _cyclotomic_factorization(k):
+    """Φ_k(2) 的素因子分解, Φ_k(2) = Π_(d|k) (2^d - 1)^μ(k/d); 优先查预先分解好的表"""
+    if k in _cyclotomic_table():
+        factors = {}
+        for q in _cyclotomic_table()[k]:
+            factors[q] = factors.get(q, 0) + 1
+        return factors
+    numerator, denominator = 1, 1
+    for d in sympy.divisors(k):
+        mu = _mobius(k // d)
+        if mu == 1:
+            numerator *= (1 << d) - 1
+        elif mu == -1:
+            denominator *= (1 << d) - 1
+    return sympy.factorint(numerator // denominator)
+
+
+@lru_cache(maxsize=None)
+def mersenne_factorization(m):
+    """
+    2^m - 1 的素因子分解(带缓存)
+
+    按 2^m - 1 = Π_(d|m) Φ_d(2) 分块分解, 每块比整体小得多, 且不同 m 之间可以共享缓存.
+    m ≤ 800 时各块都在随脚本附带的分解表中, 不需要做任何整数分解.
+    """
+    factors = {}
+    for d in sympy.divisors(m):
+        for q, e in _cyclotomic_factorization(d).items():
+            factors[q] = factors.get(q, 0) + e
+    return factors
+
+
+def _irreducible_order(poly):
+    """不可约多项式的阶: 2^m - 1 的因子中使 x^e ≡ 1 的最小者"""
+    m = _degree(poly)
+    if poly == 0b10:
+        raise ValueError("x 没有阶")
+    mod = _Modulus(poly)
+    order = (1 << m) - 1
+    for q, e in mersenne_factorization(m).items():
+        for _ in range(e):
+            if mod.pow_x(order // q) == 1:
+                order //= q
+            else:
+                break
+    return order
+
+
+def is_primitive(poly):
+    """判断多项式是否本原(不可约且阶为 2^n - 1)"""
+    n = _degree(poly)
+    if not is_irreducible(poly) or not poly & 1:
+        return False
+    if n == 1:
+        return poly == 0b11
+    mod = _Modulus(poly)
+    order = (1 << n) - 1
+    return all(mod.pow_x(order // q) != 1 for q in mersenne_factorization(n))
+
+
+def _squarefree_factorization(f):
+    """无平方分解, 返回 [(无平方因子, 重数), ...]"""
+    result = []
+    c = _gcd(f, _derivative(f))
+    w = _divmod(f, c)[0]
+    i = 1
+    while w != 1:
+        y = _gcd(w, c)
+        factor = _divmod(w, y)[0]
+        if factor != 1:
+            result.append((factor, i))
+        w = y
+        c = _divmod(c, y)[0]
+        i += 1
+    if c != 1:
+        result += [(g, 2 * e) for g, e in _squarefree_factorization(_sqrt(c))]
+    return result
+
+
+def _distinct_degree_factorization(f):
+    result = []
+    i = 1
+    h = 2
+    mod = _Modulus(f)
+    while _degree(f) >= 2 * i:
+        h = mod.sqr(h)
+        g = _gcd(f, h ^ 2)
+        if g != 1:
+            result.append((g, i))
+            f = _divmod(f, g)[0]
+            mod = _Modulus(f)
+            h = mod.reduce(h)
+        i += 1
+    if f != 1:
+        result.append((f, _degree(f)))
+    return result
+
+
+def _equal_degree_factorization(f, d, rng):
+    """Cantor-Zassenhaus 等次分解(特征2): 用迹映射 a + a² + ... + a^(2^(d-1)) 随机分裂"""
+    if _degree(f) == d:
+        return [f]
+    mod = _Modulus(f)
+    while True:
+        a = rng.getrandbits(_degree(f)) or 2
+        trace = s = a
+        for _ in range(d - 1):
+            s = mod.sqr(s)
+            trace ^= s
+        g = _gcd(f, trace)
+        if 0 < _degree(g) < _degree(f):
+            return (_equal_degree_factorization(g, d, rng)
+                    + _equal_degree_factorization(_divmod(f, g)[0], d, rng))
+
+
+def factor_polynomial(poly, rng=None):
+    """GF(2) 上的多项式分解, 返回按次数排序的 [(不可约因子, 重数), ...]"""
+    if poly == 0:
+        raise ValueError("不能分解零多项式")
+    rng = rng or random.Random()
+    factors = []
+    # x 的因子单独提出
+    if not poly & 1:
+        low = (poly & -poly).bit_length() - 1
+        factors.append((0b10, low))
+        poly >>= low
+    if poly == 1:
+        return factors
+    # 常见情形(抽头本身就不可约)用 Rabin 判定直接返回, 省去逐次求 gcd 的等次分解
+    if is_irreducible(poly):
+        return sorted(factors + [(poly, 1)])
+    for g, e in _squarefree_factorization(poly):
+        for h, d in _distinct_degree_factorization(g):
+            factors += [(p, e) for p in _equal_degree_factorization(h, d, rng)]
+    return sorted(factors)
+
+
+def polynomial_order(poly, factors=None):
+    """
+    多项式的阶: 使 f(x) | x^e - 1 的最小正整数 e(要求常数项为1)
+
+    f = Π f_i^(e_i) 时, ord(f) = lcm(ord(f_i)) · 2^t, 其中 2^t 是不小于 max(e_i) 的最小2的幂.
+    已有分解结果时可通过 factors 传入, 避免重复分解.
+    """
+    if not poly & 1:
+        raise ValueError("常数项为0的多项式没有阶")
+    if poly == 1:
+        return 1
+    factors = factors or factor_polynomial(poly)
+    order = 1
+    for f, _ in factors:
+        order = math.lcm(order, _irreducible_order(f))
+    max_multiplicity = max(e for _, e in factors)
+    return order << (max_multiplicity - 1).bit_length()
+
+
+def analyze_taps(degree, taps):
+    """
+    分析 LFSR 的反馈多项式
+
+    返回字典: polynomial(多项式字符串), factors([(因子字符串, 重数)]), irreducible, primitive,
+    order(反馈多项式的阶, 即非零初态下周期的上界), maximal_length(是否对所有非零初态达到 2^n - 1),
+    singular(最高抽头不是 degree 时序列只是最终周期的).
+    """
+    poly = feedback_polynomial(degree, taps)
+    factors = factor_polynomial(poly) if poly != 1 else []
+    irreducible = len(factors) == 1 and factors[0][1] == 1
+    order = polynomial_order(poly, factors)
+    primitive = irreducible and _degree(poly) == degree and order == (1 << degree) - 1
+    return {
+        'polynomial': poly_to_str(poly),
+        'factors': [(poly_to_str(f), e) for f, e in factors],
+        'irreducible': irreducible,
+        'primitive': primitive,
+        'order': order,
+        'maximal_length': primitive,
+        'singular': _degree(poly) != degree,
+    }
+
+
+def sequence_period(degree, taps, initial_state):
+    """
+    求某一初态下输出序列的(最终)周期, 不需要逐步走完整个周期
+
+    用 Berlekamp-Massey 从前 2·degree 位求出序列的极小多项式, 其阶即为周期.
+    """
+    from LFSR import LFSR
+    from BM算法LFSR综合 import LinearComplexity
+
+    lc = LinearComplexity()
+    lc.feed(LFSR(degree, taps, initial_state).generate_sequence(2 * degree))
+    if lc.linear_complexity == 0:
+        return 1
+    # 连接多项式次数低于线性复杂度时, 多出来的部分是序列的非周期前缀
+    return polynomial_order(lc.connection)
+
+
+def _check_tap_weight(weight):
+    if weight < 2 or weight % 2:
+        raise ValueError("本原多项式必须有奇数个非零项, 抽头个数应为正偶数")
+
+
+def find_primitive_taps(degree, weight=2, rng=None, max_tries=None):
+    """
+    随机搜索一组本原抽头, 抽头个数为 weight(包含 degree 本身)
+
+    不可约多项式的非零项数必为奇数(否则被 x+1 整除), 所以 weight 必须是偶数.
+    由 Swan 定理, 级数为 8 的倍数时不存在不可约三项式, 此时 weight=2 直接报错.
+    给定 max_tries 且次数用尽时返回 None.
+    """
+    _check_tap_weight(weight)
+    if degree < weight:
+        raise ValueError("抽头个数不能超过级数")
+    if weight == 2 and degree % 8 == 0:
+        raise ValueError(f"{degree} 级不存在本原三项式(Swan 定理), 请使用 --weight 4")
+    rng = rng or random.Random()
+    tries = 0
+    while max_tries is None or tries < max_tries:
+        tries += 1
+        taps = sorted(rng.sample(range(1, degree), weight - 1)) + [degree]
+        if is_primitive(feedback_polynomial(degree, taps)):
+            return taps
+    return None
+
+
+def iter_primitive_taps(degree, weight=2):
+    """按字典序枚举抽头个数为 weight 的全部本原抽头组合(包含 degree 本身)"""
+    _check_tap_weight(weight)
+    for middle in itertools.combinations(range(1, degree), weight - 1):
+        taps = list(middle) + [degree]
+        if is_primitive(feedback_polynomial(degree, taps)):
+            yield taps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LFSR反馈多项式分析")
+    parser.add_argument("config_file", nargs="?", default="LFSR", help="LFSR配置文件(默认 LFSR)")
+    parser.add_argument("--search", type=int, metavar="DEGREE", help="随机搜索给定级数的本原抽头")
+    parser.add_argument("--enumerate", type=int, metavar="DEGREE", help="枚举给定级数的本原抽头")
+    parser.add_argument("--weight", type=int, default=2, help="搜索/枚举时的抽头个数(默认2)")
+    parser.add_argument("--count", type=int, default=10, help="枚举的最大个数")
+    parser.add_argument("--max-tries", type=int, default=None, help="随机搜索的最大尝试次数(默认不限)")
+    args = parser.parse_args()
+
+    if args.search:
+        try:
+            taps = find_primitive_taps(args.search, args.weight, max_tries=args.max_tries)
+        except ValueError as e:
+            parser.error(str(e))
+        if taps is None:
+            parser.error(f"尝试 {args.max_tries} 次后仍未找到 {args.search} 级本原抽头")
+        print(f"{args.search} 级本原抽头: {taps}")
+        print(f"反馈多项式: {poly_to_str(feedback_polynomial(args.search, taps))}")
+        return
+    if args.enumerate:
+        for taps in itertools.islice(iter_primitive_taps(args.enumerate, args.weight), args.count):
+            print(taps)
+        return
+
+    degree, taps, initial_state, _ = read_config_file(args.config_file)
+    report = analyze_taps(degree, taps)
+    print(f"级数: {degree}")
+    print(f"抽头系数: {taps}")
+    print(f"反馈多项式: {report['polynomial']}")
+    print("因式分解: " + " · ".join(f"({f})" + (f"^{e}" if e > 1 else "") for f, e in report['factors']))
+    print(f"不可约: {'是' if report['irreducible'] else '否'}")
+    print(f"本原: {'是' if report['primitive'] else '否'}")
+    print(f"多项式的阶: {report['order']}")
+    print(f"m序列(最大周期 {2 ** degree - 1}): {'是' if report['maximal_length'] else '否'}")
+    print(f"初态 {initial_state} 的周期: {sequence_period(degree, taps, initial_state)}")
+
+
+if __name__ == "__main__":
+    main()
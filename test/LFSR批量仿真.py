@@ -0,0 +1,271 @@
+import time
+
+import numpy as np
+
+from LFSR import LFSR
+
+# 查表推进时各LFSR查找表的总字节数上限, 超过时改用较窄的字
+TABLE_BUDGET = 1 << 26
+
+
+def _parity(x):
+    """uint64 数组逐元素求奇偶性"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(x) & np.uint8(1)
+    x = x ^ (x >> np.uint64(32))
+    x ^= x >> np.uint64(16)
+    x ^= x >> np.uint64(8)
+    x ^= x >> np.uint64(4)
+    x ^= x >> np.uint64(2)
+    x ^= x >> np.uint64(1)
+    return (x & np.uint64(1)).astype(np.uint8)
+
+
+class BatchLFSR:
+    """
+    批量仿真N个LFSR(级数不超过64), 每个LFSR可以有不同的级数、抽头和初态
+
+    每个LFSR的状态打包在一个 uint64 中, 第p位对应 state[p](与 LFSR 类相同),
+    每一步对全部N个状态同时做移位、与运算和奇偶校验, 用NumPy向量运算代替逐个对象的Python循环.
+    级数不超过56时先为每个LFSR建好"状态字节 → 后续8·width个反馈位"的查找表, 每次NumPy迭代前进一整个字.
+    """
+
+    def __init__(self, degrees, taps_list, initial_states):
+        """
+        参数:
+            degrees: 每个LFSR的级数(列表), 或所有LFSR共用的一个整数
+            taps_list: 每个LFSR的抽头位置列表, 或所有LFSR共用的一个抽头列表
+            initial_states: 每个LFSR的初态(0/1列表), 级数相同时也可以是 N×degree 的数组
+        """
+        count = len(initial_states)
+        if np.ndim(degrees) == 0:
+            degrees = [int(degrees)] * count
+        degrees = [int(d) for d in degrees]
+        if taps_list and np.ndim(taps_list[0]) == 0:
+            taps_list = [list(taps_list)] * count
+        if not (len(degrees) == len(taps_list) == count):
+            raise ValueError("级数、抽头和初态的个数必须相同")
+        if any(not 1 <= d <= 64 for d in degrees):
+            raise ValueError("批量仿真只支持1到64级的LFSR")
+
+        tap_masks = []
+        for degree, taps in zip(degrees, taps_list):
+            mask = 0
+            for tap in taps:
+                if tap < 1 or tap > degree:
+                    raise ValueError("抽头位置必须在1到级数范围内")
+                mask ^= 1 << (tap - 1)
+            tap_masks.append(mask)
+
+        if count and len(set(degrees)) == 1 and np.ndim(initial_states) == 2:
+            # 级数相同时整批打包: 第p列移到第p位
+            bits = np.asarray(initial_states)
+            if bits.shape[1] != degrees[0]:
+                raise ValueError("初态长度必须与级数相同")
+            if not np.isin(bits, (0, 1)).all():
+                raise ValueError("初态只能包含0和1")
+            weights = np.left_shift(np.uint64(1), np.arange(degrees[0], dtype=np.uint64))
+            regs = np.bitwise_or.reduce(bits.astype(np.uint64) * weights, axis=1)
+        else:
+            regs = []
+            for degree, state in zip(degrees, initial_states):
+                if len(state) != degree:
+                    raise ValueError("初态长度必须与级数相同")
+                if any(x not in {0, 1} for x in state):
+                    raise ValueError("初态只能包含0和1")
+                regs.append(sum(int(bit) << p for p, bit in enumerate(state)))
+
+        self.count = count
+        self.degrees = np.array(degrees, dtype=np.uint64)
+        self._reg = np.array(regs, dtype=np.uint64)
+        self._tap_mask = np.array(tap_masks, dtype=np.uint64)
+        self._out_shift = self.degrees - np.uint64(1)
+        self._state_mask = np.array([(1 << d) - 1 for d in degrees], dtype=np.uint64)
+
+    @classmethod
+    def from_lfsrs(cls, lfsrs):
+        """由一组 LFSR 对象(按其当前状态)构造"""
+        return cls([l.degree for l in lfsrs], [l.taps for l in lfsrs], [l.state for l in lfsrs])
+
+    @property
+    def states(self):
+        """每个LFSR的当前状态(0/1列表)"""
+        return [[(int(reg) >> p) & 1 for p in range(int(d))] for reg, d in zip(self._reg, self.degrees)]
+
+    def generate_packed(self, length):
+        """
+        所有LFSR同时生成 length 位输出
+
+        返回 N × ⌈length/8⌉ 的 uint8 矩阵, 第i行与第i个LFSR的 generate_packed(length) 相同
+        (每字节高位在前, 末字节低位补0).
+        """
+        out = np.zeros((self.count, (length + 7) // 8), dtype=np.uint8)
+        if self.count == 0:
+            return out
+        if int(self.degrees.max()) > 56:
+            return self._generate_packed_wide(length, out)
+
+        # 每步不截断寄存器: 移出状态的位继续留在高位, 第 degree 位往上正好是最近输出的位,
+        # 每前进8·width步取一次 reg >> degree 的低 8·width 位就是高位在前打包好的输出字
+        reg = self._reg.astype('<u8')
+        width = self._word_bytes()
+        words = length // (8 * width)
+        if words:
+            # 整字部分: 每次查表求出后 8·width 个反馈位, 一次前进 8·width 步
+            tables = self._word_tables(width)
+            n = self.count
+            rows = np.arange(n, dtype=np.intp)
+            stride = np.intp(n)
+            reg_bytes = reg.view(np.uint8).reshape(n, 8)
+            # 左移 8·width 位后寄存器的最低字为0, 直接写入反馈字
+            reg_low = reg.view(f'<u{width}').reshape(n, 8 // width)[:, 0]
+            index = np.empty(n, dtype=np.intp)
+            feedback = np.empty(n, dtype=tables[0].dtype)
+            term = np.empty_like(feedback)
+            shifted = np.empty_like(reg)
+            columns = np.empty((words, n), dtype=tables[0].dtype)
+            shift = np.uint64(8 * width)
+            for k in range(words):
+                np.multiply(reg_bytes[:, 0], stride, out=index)
+                index += rows
+                np.take(tables[0], index, out=feedback)
+                for b in range(1, len(tables)):
+                    np.multiply(reg_bytes[:, b], stride, out=index)
+                    index += rows
+                    np.take(tables[b], index, out=term)
+                    feedback ^= term
+                np.left_shift(reg, shift, out=reg)
+                reg_low[...] = feedback
+                np.right_shift(reg, self.degrees, out=shifted)
+                columns[k] = shifted
+            # 每个字按大端序展开就是高位在前的 width 个输出字节
+            out[:, :words * width] = columns.T.astype(f'>u{width}', order='C').view(np.uint8)
+
+        tmp = np.empty_like(reg)
+        one = np.uint64(1)
+        for k in range(8 * width * words, length):
+            np.bitwise_and(reg, self._tap_mask, out=tmp)
+            feedback = _parity(tmp)
+            np.left_shift(reg, one, out=reg)
+            reg |= feedback
+            if k % 8 == 7:
+                out[:, k >> 3] = reg >> self.degrees
+        if length % 8:
+            tail = (reg >> self.degrees) & np.uint64((1 << (length % 8)) - 1)
+            out[:, length >> 3] = tail << np.uint64(8 - length % 8)
+        self._reg = reg & self._state_mask
+        return out
+
+    def _word_bytes(self):
+        """查表一步前进的字节数: 4、2或1, 要求寄存器高位放得下这么多输出位且查找表总大小不超过 TABLE_BUDGET"""
+        degree = int(self.degrees.max())
+        positions = (degree + 7) // 8
+        for width in (4, 2):
+            if degree + 8 * width <= 64 and self.count * positions * 256 * width <= TABLE_BUDGET:
+                return width
+        return 1
+
+    def _word_tables(self, width):
+        """
+        接下来 W = 8·width 个反馈位关于当前状态的查找表
+
+        W个反馈位按高位在前组成一个字, 它是状态的线性函数, 状态第p位的贡献(列)X_p 就是从单位状态 e_p
+        出发的前W个反馈位. 记 F_p(j) 为从 e_p 出发的第j个反馈位, 走一步后 e_p 变成 e_(p+1) ⊕ F_p(0)·e_0,
+        所以 F_p(j+1) = F_(p+1)(j) ⊕ t_p·F_0(j)(t_p 为抽头掩码第p位). 先逐位算出 e_0 的 W+degree 个反馈位 U_0,
+        再按 U_(p+1) = (U_p << 1) ⊕ t_p·U_0 递推, 每步只有末位失效, 取高W位即得各列.
+        按状态的每个字节拆开, 每个LFSR的每个字节位置各有一张256项的表, 表项由各列按异或逐位倍增填出.
+        返回 ⌈最大级数/8⌉ 张表, 每张展平为 256·N 个 uint(W)(字节值v、第i个LFSR的表项在 v·N + i).
+        """
+        n = self.count
+        bits = 8 * width
+        degree = int(self.degrees.max())
+        length = bits + degree
+        one = np.uint64(1)
+
+        # U_0: 从 e_0 出发的 length 个反馈位, 第一个在最高位(第 length-1 位)
+        reg = np.ones(n, dtype=np.uint64)
+        sequence = np.zeros(n, dtype=np.uint64)
+        tmp = np.empty_like(reg)
+        for _ in range(length):
+            np.bitwise_and(reg, self._tap_mask, out=tmp)
+            feedback = _parity(tmp).astype(np.uint64)
+            sequence <<= one
+            sequence |= feedback
+            reg <<= one
+            reg |= feedback
+
+        columns = np.empty((degree, n), dtype=f'u{width}')
+        word_mask = np.uint64((1 << length) - 1)
+        drop = np.uint64(length - bits)
+        current = sequence.copy()
+        for p in range(degree):
+            columns[p] = current >> drop
+            current = ((current << one) ^ (((self._tap_mask >> np.uint64(p)) & one) * sequence)) & word_mask
+
+        tables = []
+        for b in range((degree + 7) // 8):
+            table = np.empty((256, n), dtype=columns.dtype)
+            table[0] = 0
+            for k in range(min(8, degree - 8 * b)):
+                np.bitwise_xor(table[:1 << k], columns[8 * b + k], out=table[1 << k:2 << k])
+            # 超出级数的位(较早的输出位)对反馈没有贡献
+            for k in range(degree - 8 * b, 8):
+                table[1 << k:2 << k] = table[:1 << k]
+            tables.append(table.ravel())
+        return tables
+
+    def _generate_packed_wide(self, length, out):
+        """级数超过56时寄存器高位放不下8个输出位, 逐步取输出位"""
+        reg = self._reg
+        tmp = np.empty_like(reg)
+        acc = np.zeros(self.count, dtype=np.uint8)
+        one = np.uint64(1)
+        for k in range(length):
+            # 输出位 = state[-1], 反馈位 = 抽头位的异或
+            np.right_shift(reg, self._out_shift, out=tmp)
+            acc <<= np.uint8(1)
+            acc |= (tmp & one).astype(np.uint8)
+            np.bitwise_and(reg, self._tap_mask, out=tmp)
+            feedback = _parity(tmp)
+            np.left_shift(reg, one, out=reg)
+            reg |= feedback
+            reg &= self._state_mask
+            if k % 8 == 7:
+                out[:, k >> 3] = acc
+                acc[:] = 0
+        if length % 8:
+            out[:, length >> 3] = acc << np.uint8(8 - length % 8)
+        return out
+
+    def generate_sequences(self, length):
+        """所有LFSR同时生成 length 位输出, 返回 N × length 的 0/1 矩阵"""
+        return np.unpackbits(self.generate_packed(length), axis=1)[:, :length]
+
+
+def benchmark(count=10000, degree=31, length=1024):
+    """比较批量仿真与逐个运行 LFSR 对象的速度"""
+    rng = np.random.default_rng()
+    states = rng.integers(0, 2, size=(count, degree), dtype=np.uint8)
+    taps_list = [sorted(set(rng.integers(1, degree + 1, size=3).tolist()) | {degree}) for _ in range(count)]
+
+    start = time.perf_counter()
+    batch = BatchLFSR(degree, taps_list, states)
+    packed = batch.generate_packed(length)
+    batch_time = time.perf_counter() - start
+
+    # 逐个对象的基准只取一部分再按比例折算
+    sample = min(count, 200)
+    start = time.perf_counter()
+    for i in range(sample):
+        sequence = LFSR(degree, taps_list[i], states[i].tolist()).generate_sequence(length)
+        assert (np.packbits(np.array(sequence, dtype=np.uint8)) == packed[i]).all()
+    loop_time = (time.perf_counter() - start) * count / sample
+
+    print(f"{count} 个 {degree} 级LFSR, 每个生成 {length} 位")
+    print(f"批量仿真: {batch_time:.3f} 秒")
+    print(f"逐个运行(估计): {loop_time:.3f} 秒")
+    print(f"加速比: {loop_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
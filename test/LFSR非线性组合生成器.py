@@ -0,0 +1,145 @@
+import abc
+
+from LFSR import LFSR, PackedLFSR
+
+
+def _parse_truth_table(truth_table, inputs):
+    """真值表可以是0/1列表或 '0110...' 字符串, 第x项是输入 (x的第i位 = 第i个输入) 时的函数值"""
+    if isinstance(truth_table, str):
+        truth_table = [int(c) for c in truth_table.replace(" ", "")]
+    truth_table = list(truth_table)
+    if len(truth_table) != 2 ** inputs:
+        raise ValueError(f"输入个数为{inputs}, 真值表长度应为{2 ** inputs}, 但得到的是{len(truth_table)}")
+    if any(x not in {0, 1} for x in truth_table):
+        raise ValueError("真值表只能包含0和1")
+    return truth_table
+
+
+def _algebraic_normal_form(truth_table):
+    """Möbius变换: 由真值表求代数正规型系数, anf[u]=1 表示单项式 Π_(i∈u) x_i 出现"""
+    anf = list(truth_table)
+    h = 1
+    while h < len(anf):
+        for i in range(len(anf)):
+            if i & h:
+                anf[i] ^= anf[i ^ h]
+        h <<= 1
+    return anf
+
+
+class _BitslicedGenerator(abc.ABC):
+    """
+    按块输出的布尔函数生成器基类
+
+    每种配置只在构造时把真值表变换为代数正规型一次; 之后每一块输出把各输入位流打包成整数,
+    按单项式做整块的与运算、再整块异或, 一块的代价是若干次大整数运算而不是每位调用一次Python函数.
+    """
+
+    def __init__(self, truth_table, inputs):
+        self.truth_table = _parse_truth_table(truth_table, inputs)
+        anf = _algebraic_normal_form(self.truth_table)
+        self._monomials = [u for u in range(len(anf)) if anf[u]]
+
+    @abc.abstractmethod
+    def _input_streams(self, nbits):
+        """返回各输入接下来 nbits 位组成的整数(高位在前)"""
+
+    def _generate(self, nbits):
+        """生成 nbits 位输出并按高位在前打包为字节(末字节低位补0)"""
+        streams = self._input_streams(nbits)
+        full = (1 << nbits) - 1
+        # 单项式乘积按"去掉最低位的子集"递推, 每个单项式只需一次与运算
+        products = {0: full}
+
+        def product(u):
+            if u not in products:
+                low = u & -u
+                products[u] = product(u ^ low) & streams[low.bit_length() - 1]
+            return products[u]
+
+        output = 0
+        for u in self._monomials:
+            output ^= product(u)
+        pad = -nbits % 8
+        return (output << pad).to_bytes((nbits + pad) // 8, 'big')
+
+    def generate_bytes(self, n):
+        """生成 n 个字节(8n 位)的输出, 每个字节高位在前"""
+        return self._generate(8 * n)
+
+    def generate_sequence(self, length):
+        """生成指定长度的输出序列"""
+        data = self._generate(length)
+        bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b')
+        return list(map(int, bits[:length]))
+
+    def next_bit(self):
+        """生成下一个比特"""
+        return self.generate_sequence(1)[0]
+
+
+class CombinerGenerator(_BitslicedGenerator):
+    """
+    非线性组合生成器: z_t = f(x1_t, x2_t, ..., xk_t), 其中 xi_t 是第i个LFSR的输出
+
+    例如 Geffe 生成器 f(x1, x2, x3) = x1·x2 ⊕ (1⊕x2)·x3, 真值表为 [0,0,0,1,1,1,0,1].
+    """
+
+    def __init__(self, lfsrs, truth_table):
+        """
+        参数:
+            lfsrs (list): LFSR 对象列表(按各自当前状态复制, 原对象不受影响)
+            truth_table: 组合函数的真值表, 长度 2^k, 第x项对应第i个LFSR输出为x的第i位
+        """
+        super().__init__(truth_table, len(lfsrs))
+        self.lfsrs = [PackedLFSR.from_lfsr(lfsr) for lfsr in lfsrs]
+
+    def _input_streams(self, nbits):
+        return [int.from_bytes(lfsr._generate(nbits), 'big') >> (-nbits % 8) for lfsr in self.lfsrs]
+
+
+class FilterGenerator(_BitslicedGenerator):
+    """
+    前馈(滤波)生成器: z_t = f(state_t[p1], ..., state_t[pk]), 输入取自同一个LFSR状态的若干位置
+    """
+
+    def __init__(self, lfsr, positions, truth_table):
+        """
+        参数:
+            lfsr (LFSR): LFSR 对象(按其当前状态复制)
+            positions (list): 滤波函数的输入位置, 对应 state 列表的下标(从0开始)
+            truth_table: 滤波函数的真值表, 第x项对应第i个输入为x的第i位
+        """
+        if any(p < 0 or p >= lfsr.degree for p in positions):
+            raise ValueError("滤波位置必须在0到级数-1范围内")
+        super().__init__(truth_table, len(positions))
+        self.lfsr = PackedLFSR.from_lfsr(lfsr)
+        self.positions = list(positions)
+
+    def _input_streams(self, nbits):
+        # 输出的 nbits 位接上新状态, 得到序列 a_0 ... a_(n+d-1);
+        # t 时刻 state[p] = a_(t+d-1-p), 对应的位流就是整段右移 p+1 位
+        d = self.lfsr.degree
+        stream = int.from_bytes(self.lfsr._generate(nbits), 'big') >> (-nbits % 8)
+        state = sum(bit << p for p, bit in enumerate(self.lfsr.state))
+        sequence = (stream << d) | state
+        mask = (1 << nbits) - 1
+        return [(sequence >> (p + 1)) & mask for p in self.positions]
+
+
+if __name__ == "__main__":
+    # Geffe 生成器示例
+    lfsrs = [
+        LFSR(5, [2, 5], [1, 0, 0, 1, 1]),
+        LFSR(7, [1, 7], [0, 1, 1, 0, 1, 0, 1]),
+        LFSR(11, [2, 11], [1, 0, 1, 1, 0, 0, 1, 0, 1, 1, 1]),
+    ]
+    geffe_table = [0, 0, 0, 1, 1, 1, 0, 1]
+    geffe = CombinerGenerator(lfsrs, geffe_table)
+    print("Geffe 生成器输出:")
+    print(''.join(map(str, geffe.generate_sequence(64))))
+
+    # 滤波生成器示例: f(a, b, c) = a ⊕ b·c
+    filter_generator = FilterGenerator(LFSR(7, [1, 7], [0, 1, 1, 0, 1, 0, 1]), [0, 3, 6], [0, 1, 0, 1, 0, 1, 1, 0])
+    print("\n滤波生成器输出:")
+    print(''.join(map(str, filter_generator.generate_sequence(64))))
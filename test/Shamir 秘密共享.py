@@ -1,40 +1,206 @@
+import operator
+import os
 import random
-from sympy import randprime  # 用于生成大素数
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from sympy import isprime, randprime  # 用于生成大素数
+
+# 门限值达到该值时, 大量参与者的子秘密改用乘积树多点求值(否则逐点Horner求值更快)
+MULTIPOINT_THRESHOLD = 64
+
+# 乘积树中结点的点数不超过该值时直接逐点Horner求值
+TREE_LEAF_SIZE = 32
+
+# 子秘密文件头: 魔数, 门限值, 总数, 本文件的x坐标, 每个域元素打包的字节数, 每块的域元素个数,
+# 原文件长度, 素数p的字节数; 之后是素数p(大端), 再之后每块一条记录: 该块每个域元素的y值(各占p的字节数)
+SHARE_FILE_MAGIC = b'SSSF'
+SHARE_FILE_HEADER = struct.Struct('>4sHHHHIQH')
+
+# 批量验证子秘密时随机权重的位数: 错误的子秘密通过批量验证的概率约为 2^(-该值)
+BATCH_WEIGHT_BITS = 64
+
+# 多指数运算和固定底数表的窗口宽度(位)
+EXPONENT_WINDOW = 4
+
+# 批量验证的随机权重必须不可预测, 用系统随机源
+_system_random = random.SystemRandom()
+
+
+def _pack(values, width):
+    """把非负整数序列按每个 width 字节打包成一个大整数(第一个值在最低位)"""
+    return int.from_bytes(b''.join(v.to_bytes(width, 'little') for v in values), 'little')
+
+
+def _unpack(number, count, width, p):
+    """_pack 的逆运算, 拆出 count 个槽位并各自模p"""
+    data = number.to_bytes(width * count, 'little')
+    return [int.from_bytes(data[i:i + width], 'little') % p for i in range(0, len(data), width)]
+
+
+def _batch_inverse(values, p):
+    """
+    Montgomery批量求逆: 先求前缀积, 只对总乘积求一次逆, 再倒推出每个值的逆,
+    代价为一次求逆加约 3n 次乘法
+    """
+    prefix = [1]
+    for v in values:
+        prefix.append(prefix[-1] * v % p)
+    inverse = pow(prefix[-1], -1, p)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        result[i] = prefix[i] * inverse % p
+        inverse = inverse * values[i] % p
+    return result
+
+
+@lru_cache(maxsize=1024)
+def lagrange_coefficients(xs, p):
+    """
+    在0处插值的拉格朗日系数 l_j = Π_(i≠j) x_i / (x_i - x_j) mod p
+    xs 为排好序的x坐标元组, 结果按 (xs, p) 缓存, 同一组参与者重复恢复时不再计算;
+    分子用前缀积和后缀积得到, 所有分母用一次批量求逆。
+    """
+    if len(set(xs)) != len(xs):
+        raise ValueError("Duplicate x-coordinates in shares.")
+    t = len(xs)
+    prefix, suffix = [1] * (t + 1), [1] * (t + 1)
+    for i in range(t):
+        prefix[i + 1] = prefix[i] * xs[i] % p
+        suffix[t - 1 - i] = suffix[t - i] * xs[t - 1 - i] % p
+    denominators = []
+    for j in range(t):
+        d = 1
+        for i in range(t):
+            if i != j:
+                d = d * (xs[i] - xs[j]) % p
+        denominators.append(d)
+    inverses = _batch_inverse(denominators, p)
+    return tuple(prefix[j] * suffix[j + 1] % p * inverses[j] % p for j in range(t))
+
+
+def _poly_mul(a, b, p):
+    """
+    多项式乘法 mod p(系数从低次到高次), 用Kronecker代换: 系数按固定宽度打包成一个大整数,
+    一次大整数乘法(Karatsuba)后再拆开, 每个槽位足够容纳 Σ a_i·b_j 而不会进位到相邻槽位
+    """
+    if not a or not b:
+        return []
+    width = (2 * p.bit_length() + min(len(a), len(b)).bit_length() + 7) // 8
+    return _unpack(_pack(a, width) * _pack(b, width), len(a) + len(b) - 1, width, p)
+
+
+def _poly_inverse(f, k, p):
+    """Newton迭代求 f 的逆 mod x^k(f[0] 可逆): g ← g·(2 - f·g), 每次精度翻倍"""
+    g = [pow(f[0], -1, p)]
+    while len(g) < k:
+        m = min(2 * len(g), k)
+        fg = _poly_mul(f[:m], g, p)[:m]
+        correction = _poly_mul(g, [(-c) % p for c in fg[len(g):]], p)[:m - len(g)]
+        g = g + correction + [0] * (m - len(g) - len(correction))
+    return g[:k]
+
+
+class _SubproductTree:
+    """
+    点集 xs 的乘积树: 每个结点保存 Π(x - x_i) 及其反序多项式的逆(用于快速取余), 建一次可对多个多项式重复使用
+    """
+
+    def __init__(self, xs, p):
+        self.xs = list(xs)
+        self.p = p
+        self.size = len(self.xs)
+        if self.size > TREE_LEAF_SIZE:
+            middle = self.size // 2
+            self.children = (_SubproductTree(self.xs[:middle], p), _SubproductTree(self.xs[middle:], p))
+            self.poly = _poly_mul(self.children[0].poly, self.children[1].poly, p)
+        else:
+            self.children = None
+            self.poly = [1]
+            for x in self.xs:
+                self.poly = _poly_mul(self.poly, [(-x) % p, 1], p)
+        self._inverse = None
+
+    def remainder(self, f):
+        """f mod 本结点多项式(首一): 商的反序 = f的反序 × 结点反序的逆, 只需两次乘法"""
+        p, m = self.p, len(self.poly) - 1
+        n = len(f) - 1
+        if n < m:
+            return f
+        k = n - m + 1
+        if self._inverse is None or len(self._inverse) < k:
+            self._inverse = _poly_inverse(self.poly[::-1], max(k, m), p)
+        quotient = _poly_mul(f[::-1][:k], self._inverse[:k], p)[:k][::-1]
+        product = _poly_mul(quotient, self.poly, p)
+        return [(a - b) % p for a, b in zip(f[:m], product[:m])]
+
+    def evaluate(self, f):
+        """求 f 在所有点上的值: 自顶向下逐层取余, 叶结点逐点Horner求值"""
+        f = self.remainder(f)
+        if self.children is None:
+            values = []
+            for x in self.xs:
+                y = 0
+                for c in reversed(f):
+                    y = (y * x + c) % self.p
+                values.append(y)
+            return values
+        return self.children[0].evaluate(f) + self.children[1].evaluate(f)
+
 
 class ShamirSecretSharing:
-    def __init__(self, threshold, total_shares, prime_bits=100):#是类的构造函数，用于初始化类的实例。
+    def __init__(self, threshold, total_shares, prime_bits=100, prime=None):#是类的构造函数，用于初始化类的实例。
         """
         :param threshold: 门限值t（至少需要t个子秘密恢复密钥）
         :param total_shares: 总子秘密数n
         :param prime_bits: 素数p的比特长度（默认100比特）
+        :param prime: 指定素数p（例如恢复文件时沿用分发时的p），为None时随机生成
         """
         self.threshold = threshold
         self.total_shares = total_shares
-        self.p = randprime(2**(prime_bits-1), 2**prime_bits)  # 生成100比特素数
+        if prime is not None:
+            self.p = prime
+        else:
+            self.p = randprime(2**(prime_bits-1), 2**prime_bits)  # 生成100比特素数
 
-    def generate_polynomial(self, secret):
+    def generate_polynomial(self, secret, rng=random):
         """
         生成t-1次多项式，常数项为secret
         coefficients 是一个列表，用于存储多项式的系数。
         secret 作为第一个系数，即多项式在 x=0 处的值。
         random.randint(1, self.p-1) 生成一个在 1 到 self.p-1 之间的随机整数。self.p 是一个大素数，用于定义模运算的模数。
         for _ in range(self.threshold-1) 表示循环 threshold-1 次，每次生成一个随机整数。
+        rng 是随机数来源，默认为 random 模块；需要密码学安全的系数时传入 random.SystemRandom()。
 
         数学表示：f(x) = secret + a₁x + a₂x² + ... + aₜ₋₁xᵗ⁻¹ mod p
         """
-        coefficients = [secret] + [random.randint(1, self.p-1) for _ in range(self.threshold-1)]
+        coefficients = [secret] + [rng.randint(1, self.p-1) for _ in range(self.threshold-1)]
         return coefficients
 
     def evaluate_polynomial(self, coeffs, x):
         """
         计算多项式在x处的值（模p）
-        enumerate 函数来遍历 coeffs 列表中的每一个系数及其对应的索引 i。
-        enumerate 返回的是一个元组，其中第一个元素是索引，第二个元素是对应的系数。
+        用Horner法则从最高次系数开始 y = y*x + coeff, 每一步都模p, 中间结果不会超过 p²。
         """
         y = 0
-        for i, coeff in enumerate(coeffs):
-            y += coeff * (x ** i)
-        return y % self.p
+        for coeff in reversed(coeffs):
+            y = (y * x + coeff) % self.p
+        return y
+
+    def evaluate_polynomial_many(self, coeffs, xs):
+        """
+        计算同一个多项式在多个点处的值（模p）
+        门限值较大时用乘积树多点求值, 代价约为 O(M(n)·log n)（M(n) 为n次多项式乘法的代价）,
+        而不是逐点Horner的 O(n·t)。乘积树按点集缓存, 多次调用时只建一次。
+        """
+        xs = list(xs)
+        if len(coeffs) < MULTIPOINT_THRESHOLD or len(xs) < MULTIPOINT_THRESHOLD:
+            return [self.evaluate_polynomial(coeffs, x) for x in xs]
+        tree = getattr(self, '_tree', None)
+        if tree is None or tree.xs != xs or tree.p != self.p:
+            tree = self._tree = _SubproductTree(xs, self.p)
+        return tree.evaluate(list(coeffs))
 
     def generate_shares(self, secret):
         """
@@ -51,32 +217,336 @@ class ShamirSecretSharing:
             shares.append((x, y))
         return shares
 
+    def generate_shares_many(self, secrets, rng=random):
+        """
+        批量生成多个秘密的子秘密, 每个秘密使用独立的随机多项式(系数取自 rng, 见 generate_polynomial)
+        输出: 与 secrets 对应的列表, 每项为 [(x₁, y₁), ..., (xₙ, yₙ)]
+
+        门限值较小时把所有多项式的同次系数按固定宽度打包成一个大整数(Kronecker代换),
+        每个x只需t次大整数乘加就得到全部秘密的子秘密; 门限值较大时对每个多项式用乘积树多点求值。
+        """
+        secrets = list(secrets)
+        if any(secret >= self.p for secret in secrets):
+            raise ValueError("Secret must be smaller than prime p.")
+        if not secrets:
+            return []
+        polynomials = [self.generate_polynomial(secret, rng) for secret in secrets]
+        xs = list(range(1, self.total_shares + 1))
+
+        if self.threshold >= MULTIPOINT_THRESHOLD and self.total_shares >= MULTIPOINT_THRESHOLD:
+            columns = [self.evaluate_polynomial_many(coeffs, xs) for coeffs in polynomials]
+            return [list(zip(xs, ys)) for ys in columns]
+
+        # 每个槽位容纳 Σ c_i·(x^i mod p) < t·p², 不会进位到相邻槽位
+        width = (2 * self.p.bit_length() + self.threshold.bit_length() + 7) // 8
+        packed = [_pack([coeffs[i] for coeffs in polynomials], width) for i in range(self.threshold)]
+        rows = []
+        for x in xs:
+            total, power = 0, 1
+            for column in packed:
+                total += column * power
+                power = power * x % self.p
+            rows.append(_unpack(total, len(secrets), width, self.p))
+        return [[(x, row[k]) for x, row in zip(xs, rows)] for k in range(len(secrets))]
+
     def reconstruct_secret(self, shares):
-        """通过拉格朗日插值恢复秘密（k = h(0)）"""
+        """
+        通过拉格朗日插值恢复秘密（k = h(0)）
+        拉格朗日系数按参与者的x坐标缓存（见 lagrange_coefficients），每次恢复只需一次点积。
+        """
         if len(shares) < self.threshold:
             raise ValueError(f"Need at least {self.threshold} shares to reconstruct.")
+        shares = sorted(shares)
+        coefficients = lagrange_coefficients(tuple(x for x, _ in shares), self.p)
+        return sum(y * l for (_, y), l in zip(shares, coefficients)) % self.p
+
+    def reconstruct_secrets_many(self, shares_many):
+        """
+        批量恢复多个秘密, shares_many 中每项是一个秘密的子秘密列表
+        x坐标相同的秘密共用一组缓存的拉格朗日系数, 每个秘密只剩一次 y 向量与系数向量的点积。
+        """
+        secrets = []
+        for shares in shares_many:
+            if len(shares) < self.threshold:
+                raise ValueError(f"Need at least {self.threshold} shares to reconstruct.")
+            shares = sorted(shares)
+            coefficients = lagrange_coefficients(tuple(x for x, _ in shares), self.p)
+            secrets.append(sum(map(operator.mul, (y for _, y in shares), coefficients)) % self.p)
+        return secrets
+
+    def share_file(self, path, out_dir, block_elements=4096, workers=None, max_in_flight=None):
+        """
+        流式分发文件：按块读取，每块的字节按 (p的位数-1)//8 字节一组打包成小于p的域元素，
+        每个域元素用独立的随机多项式分发，n个子秘密文件逐块追加写入。
+        各块在进程池中处理，同时在途的块数不超过 max_in_flight（默认工作进程数的两倍），内存占用与文件大小无关。
+        :return: n个子秘密文件的路径列表
+        """
+        element_bytes = (self.p.bit_length() - 1) // 8
+        if element_bytes == 0:
+            raise ValueError("Prime p is too small to pack file bytes.")
+        file_length = os.path.getsize(path)
+        prime_bytes = self.p.to_bytes((self.p.bit_length() + 7) // 8, 'big')
+        os.makedirs(out_dir, exist_ok=True)
+        name = os.path.basename(path)
+        share_paths = [os.path.join(out_dir, f"{name}.share{x}") for x in range(1, self.total_shares + 1)]
+
+        outputs = [open(share_path, 'wb') for share_path in share_paths]
+        try:
+            for x, out in enumerate(outputs, 1):
+                out.write(SHARE_FILE_HEADER.pack(SHARE_FILE_MAGIC, self.threshold, self.total_shares, x, element_bytes,
+                                                 block_elements, file_length, len(prime_bytes)))
+                out.write(prime_bytes)
+
+            def blocks():
+                with open(path, 'rb') as src:
+                    while True:
+                        data = src.read(element_bytes * block_elements)
+                        if not data:
+                            break
+                        yield self.threshold, self.total_shares, self.p, element_bytes, data
+
+            for records in _map_bounded(_share_block, blocks(), workers, max_in_flight):
+                for out, record in zip(outputs, records):
+                    out.write(record)
+        finally:
+            for out in outputs:
+                out.close()
+        return share_paths
+
+    @staticmethod
+    def reconstruct_file(share_paths, out_path, workers=None, max_in_flight=None):
+        """
+        由至少t个子秘密文件流式恢复原文件：各文件的同一块记录一起读出，
+        用同一组缓存的拉格朗日系数恢复该块的域元素，再拆回字节写出。
+        """
+        inputs = [open(share_path, 'rb') for share_path in share_paths]
+        try:
+            headers = []
+            for f in inputs:
+                magic, threshold, total, x, element_bytes, block_elements, file_length, prime_length = \
+                    SHARE_FILE_HEADER.unpack(f.read(SHARE_FILE_HEADER.size))
+                if magic != SHARE_FILE_MAGIC:
+                    raise ValueError(f"{f.name} is not a share file.")
+                p = int.from_bytes(f.read(prime_length), 'big')
+                headers.append((x, (threshold, total, element_bytes, block_elements, file_length, p)))
+            params = {params for _, params in headers}
+            if len(params) != 1:
+                raise ValueError("Share files belong to different sharings.")
+            threshold, _, element_bytes, block_elements, file_length, p = params.pop()
+            xs = [x for x, _ in headers]
+            if len(set(xs)) != len(xs):
+                raise ValueError("Duplicate x-coordinates in shares.")
+            if len(xs) < threshold:
+                raise ValueError(f"Need at least {threshold} shares to reconstruct.")
+            share_bytes = (p.bit_length() + 7) // 8
+
+            def blocks():
+                remaining = file_length
+                while remaining > 0:
+                    size = min(remaining, element_bytes * block_elements)
+                    count = -(-size // element_bytes)
+                    records = [f.read(count * share_bytes) for f in inputs]
+                    if any(len(record) != count * share_bytes for record in records):
+                        raise ValueError("Share file is truncated.")
+                    yield xs, p, element_bytes, share_bytes, records, size
+                    remaining -= size
+
+            with open(out_path, 'wb') as out:
+                for data in _map_bounded(_reconstruct_block, blocks(), workers, max_in_flight):
+                    out.write(data)
+        finally:
+            for f in inputs:
+                f.close()
+
+
+def _share_block(threshold, total, p, element_bytes, data):
+    """
+    工作进程：分发一块文件数据，返回n个子秘密文件各自的记录
+    多项式系数取自系统随机源（SystemRandom 没有可被fork继承或预测的内部状态），不改动全局 random 模块。
+    """
+    sss = ShamirSecretSharing(threshold, total, prime=p)
+    elements = [int.from_bytes(data[i:i + element_bytes], 'big') for i in range(0, len(data), element_bytes)]
+    if len(data) % element_bytes:
+        # 最后一个不完整的域元素在低位补0，恢复时按原文件长度截断
+        elements[-1] <<= 8 * (element_bytes - len(data) % element_bytes)
+    share_bytes = (p.bit_length() + 7) // 8
+    columns = zip(*sss.generate_shares_many(elements, _system_random))
+    return [b''.join(y.to_bytes(share_bytes, 'big') for _, y in column) for column in columns]
+
+
+def _reconstruct_block(xs, p, element_bytes, share_bytes, records, size):
+    """工作进程：由t个记录恢复一块文件数据（size 为该块的原始字节数）"""
+    order = sorted(range(len(xs)), key=lambda i: xs[i])
+    coefficients = lagrange_coefficients(tuple(xs[i] for i in order), p)
+    ys = [[int.from_bytes(records[i][k:k + share_bytes], 'big') for k in range(0, len(records[i]), share_bytes)]
+          for i in order]
+    elements = [sum(map(operator.mul, column, coefficients)) % p for column in zip(*ys)]
+    data = b''.join(e.to_bytes(element_bytes, 'big') for e in elements)
+    return data[:size]
+
+
+def _map_bounded(function, arguments, workers=None, max_in_flight=None):
+    """
+    按顺序产生 function(*args) 的结果；workers 不为1时在进程池中计算，
+    同时在途的任务不超过 max_in_flight（默认工作进程数的两倍）
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        for args in arguments:
+            yield function(*args)
+        return
+    limit = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for args in arguments:
+            pending.append(executor.submit(function, *args))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def schnorr_group(p, group_bits=512):
+    """
+    构造阶为p的Schnorr群: 素数 P = k·p + 1, 生成元 G = h^k mod P ≠ 1
+    :param p: 群的阶（Shamir方案的素数p）
+    :param group_bits: 素数P的比特长度
+    :return: (P, G)
+    """
+    if group_bits <= p.bit_length() + 1:
+        raise ValueError("group_bits must be larger than the bit length of p.")
+    k_bits = group_bits - p.bit_length()
+    while True:
+        k = random.getrandbits(k_bits) | (1 << (k_bits - 1))
+        k &= ~1  # p为奇素数时 k 必须为偶数 P 才可能是奇素数
+        P = k * p + 1
+        if isprime(P):
+            break
+    for h in range(2, P):
+        G = pow(h, k, P)
+        if G != 1:
+            return P, G
+
+
+class _FixedBaseTable:
+    """
+    固定底数的预计算表: table[j][d] = base^(d·2^(w·j)) mod P
+    之后计算 base^e 只需把 e 按w位一组拆开, 把各组对应的表项相乘, 不需要平方。
+    """
+
+    def __init__(self, base, modulus, exponent_bits, window=EXPONENT_WINDOW):
+        self.modulus = modulus
+        self.window = window
+        self.table = []
+        for _ in range(-(-exponent_bits // window)):
+            row = [1]
+            for _ in range((1 << window) - 1):
+                row.append(row[-1] * base % modulus)
+            self.table.append(row)
+            base = row[-1] * base % modulus
+        self._mask = (1 << window) - 1
+
+    def pow(self, e):
+        result = 1
+        for row in self.table:
+            if not e:
+                break
+            digit = e & self._mask
+            if digit:
+                result = result * row[digit] % self.modulus
+            e >>= self.window
+        if e:
+            raise ValueError("Exponent is too large for the fixed-base table.")
+        return result
+
+
+def multi_exponentiation(bases, exponents, modulus, window=EXPONENT_WINDOW):
+    """
+    Straus同时多指数运算: Π bases[i]^exponents[i] mod modulus
+    每个底数预计算 2^w 个幂, 之后从高位到低位每w位做w次公共的平方, 再乘上各底数对应的表项,
+    平方次数只有一份而不是每个底数一份。
+    """
+    tables = []
+    for base in bases:
+        row = [1]
+        for _ in range((1 << window) - 1):
+            row.append(row[-1] * base % modulus)
+        tables.append(row)
+    bits = max((e.bit_length() for e in exponents), default=0)
+    mask = (1 << window) - 1
+    result = 1
+    for shift in range(-(-bits // window) * window - window, -window, -window):
+        for _ in range(window):
+            result = result * result % modulus
+        for row, e in zip(tables, exponents):
+            digit = (e >> shift) & mask
+            if digit:
+                result = result * row[digit] % modulus
+    return result
+
+
+class FeldmanVSS(ShamirSecretSharing):
+    """
+    Feldman可验证秘密共享: 在Shamir方案的基础上公开多项式系数的承诺 C_i = G^(a_i) mod P,
+    其中G生成阶为p的Schnorr群, 参与者可以验证 G^y = Π C_i^(x^i) 而不泄露秘密。
+    """
+
+    def __init__(self, threshold, total_shares, prime_bits=100, prime=None, group_bits=512, group=None):
+        """
+        :param group_bits: Schnorr群素数P的比特长度（默认512比特）
+        :param group: 已知的 (P, G)，为None时按 group_bits 生成
+        """
+        super().__init__(threshold, total_shares, prime_bits, prime)
+        self.P, self.G = group or schnorr_group(self.p, group_bits)
+        if pow(self.G, self.p, self.P) != 1 or self.G == 1:
+            raise ValueError("G must generate a subgroup of order p.")
+        self._g_table = _FixedBaseTable(self.G, self.P, self.p.bit_length())
+
+    def generate_verifiable_shares(self, secret):
+        """
+        生成子秘密和系数承诺
+        输出: ([(x₁, y₁), ..., (xₙ, yₙ)], [C₀, C₁, ..., Cₜ₋₁])，C₀ = G^secret 是对秘密本身的承诺
+        """
+        if secret >= self.p:
+            raise ValueError("Secret must be smaller than prime p.")
+        coeffs = self.generate_polynomial(secret)
+        shares = [(x, self.evaluate_polynomial(coeffs, x)) for x in range(1, self.total_shares + 1)]
+        commitments = [self._g_table.pow(a) for a in coeffs]
+        return shares, commitments
+
+    def _commitments_in_group(self, commitments):
+        """各承诺都是阶为p的子群中的元素（指数可以模p约简的前提）"""
+        return all(0 < c < self.P and pow(c, self.p, self.P) == 1 for c in commitments)
+
+    def verify_share(self, share, commitments):
+        """验证单个子秘密: G^y == Π C_i^(x^i mod p)，右边用一次同时多指数运算"""
+        # 指数按模p约简只在阶为p的子群中成立, 与 verify_shares 一样先确认各承诺在子群中
+        if not self._commitments_in_group(commitments):
+            return False
+        x, y = share
+        exponents = [pow(x, i, self.p) for i in range(len(commitments))]
+        return self._g_table.pow(y % self.p) == multi_exponentiation(commitments, exponents, self.P)
+
+    def verify_shares(self, shares, commitments):
+        """
+        批量验证全部子秘密: 取随机权重 r_j，检查 G^(Σ r_j·y_j) == Π C_i^(Σ r_j·x_j^i)，
+        只需一次固定底数幂和一次多指数运算，而不是n次单独验证。
+        返回False时说明至少有一个子秘密（或承诺）是错的，可再用 verify_share 逐个定位。
+        """
+        # 随机线性组合只在阶为p的子群中可靠, 先确认各承诺在子群中
+        if not self._commitments_in_group(commitments):
+            return False
+        weights = [_system_random.getrandbits(BATCH_WEIGHT_BITS) for _ in shares]
+        y_total = sum(r * y for r, (_, y) in zip(weights, shares)) % self.p
+        exponents = [0] * len(commitments)
+        for r, (x, _) in zip(weights, shares):
+            power = r
+            for i in range(len(commitments)):
+                exponents[i] += power
+                power = power * x % self.p
+        exponents = [e % self.p for e in exponents]
+        return self._g_table.pow(y_total) == multi_exponentiation(commitments, exponents, self.P)
 
-        def lagrange_basis(j, x=0):
-            """
-            计算拉格朗日基多项式在x处的值
-            j 表示第j个子秘密的索引
-            x 表示插值点
-            """
-            numerator, denominator = 1, 1
-            x_j = shares[j][0]
-            for i in range(len(shares)):
-                if i != j:
-                    x_i = shares[i][0]
-                    numerator = (numerator * (x - x_i)) % self.p
-                    denominator = (denominator * (x_j - x_i)) % self.p
-            return (numerator * pow(denominator, -1, self.p)) % self.p
-
-        secret = 0
-        for j in range(len(shares)):
-            y_j = shares[j][1]
-            l_j = lagrange_basis(j)
-            secret = (secret + y_j * l_j) % self.p
-        return secret
 
 #主程序入口
 if __name__ == "__main__":
@@ -104,4 +574,32 @@ if __name__ == "__main__":
     print(f"\n原始秘密: {secret}")
     print(f"恢复的秘密: {reconstructed_secret}")
     assert secret == reconstructed_secret, "恢复失败！"
-    print("秘密恢复成功！")
\ No newline at end of file
+    print("秘密恢复成功！")
+
+    # 3. 批量秘密分发
+    secrets = [random.randint(0, sss.p - 1) for _ in range(1000)]
+    shares_many = sss.generate_shares_many(secrets)
+    assert sss.reconstruct_secrets_many([shares[:threshold] for shares in shares_many]) == secrets
+    print(f"\n批量分发并恢复 {len(secrets)} 个秘密成功！")
+
+    # 4. 文件流式分发与恢复
+    import tempfile
+    with tempfile.TemporaryDirectory() as workdir:
+        original = os.path.join(workdir, "backup.bin")
+        with open(original, 'wb') as f:
+            f.write(os.urandom(1 << 20))
+        share_paths = sss.share_file(original, os.path.join(workdir, "shares"))
+        restored = os.path.join(workdir, "restored.bin")
+        ShamirSecretSharing.reconstruct_file(random.sample(share_paths, threshold), restored)
+        with open(original, 'rb') as a, open(restored, 'rb') as b:
+            assert a.read() == b.read(), "文件恢复失败！"
+        print(f"文件流式分发为 {total_shares} 份并由 {threshold} 份恢复成功！")
+
+    # 5. Feldman可验证秘密共享
+    vss = FeldmanVSS(threshold, total_shares, prime=sss.p)
+    shares, commitments = vss.generate_verifiable_shares(secret)
+    assert vss.verify_shares(shares, commitments), "子秘密验证失败！"
+    x, y = shares[0]
+    assert not vss.verify_share((x, (y + 1) % vss.p), commitments), "篡改的子秘密未被发现！"
+    assert vss.reconstruct_secret(shares[:threshold]) == secret, "恢复失败！"
+    print(f"\nFeldman VSS: {total_shares} 个子秘密批量验证通过, 篡改的子秘密被发现！")
\ No newline at end of file
@@ -0,0 +1,234 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from 布尔函数谱值计算程序 import fast_walsh_hadamard_transform
+
+# S盒文件格式: 2^n 个输出值按输入顺序排列, 以空白或逗号分隔,
+# 每个值可以是十进制或带 0x 前缀的十六进制(--hex 时全部按十六进制解析).
+
+
+def read_sbox_file(filename, hexadecimal=False):
+    """读取S盒查找表, 返回 (n, m, uint32 数组), n 为输入位数, m 为输出位数"""
+    with open(filename, 'r') as f:
+        tokens = f.read().replace(',', ' ').split()
+    sbox = [int(t, 16) if hexadecimal else int(t, 0) for t in tokens]
+    return parse_sbox(sbox)
+
+
+def parse_sbox(sbox, m=None):
+    """
+    检查S盒查找表
+
+    参数:
+        sbox: 长度为 2^n 的输出值序列
+        m (int): 输出位数, 默认取最大输出值的位数(至少为1)
+    返回:
+        (n, m, uint32 数组)
+    """
+    sbox = np.asarray(sbox, dtype=np.int64)
+    N = sbox.size
+    if sbox.ndim != 1 or N == 0 or N & (N - 1):
+        raise ValueError(f"S盒长度必须是2的幂, 但得到的是{N}")
+    if sbox.min() < 0:
+        raise ValueError("S盒输出值不能为负")
+    if m is None:
+        m = max(int(sbox.max()).bit_length(), 1)
+    if int(sbox.max()) >> m:
+        raise ValueError(f"S盒输出值超出{m}位")
+    return N.bit_length() - 1, m, sbox.astype(np.uint32)
+
+
+def _parity(x):
+    """uint32 数组逐元素求奇偶性"""
+    x = x ^ (x >> 16)
+    x ^= x >> 8
+    x ^= x >> 4
+    x ^= x >> 2
+    x ^= x >> 1
+    return x & 1
+
+
+def _chunks(count, workers, chunk):
+    """把 0..count-1 切成若干段, 默认每个工作进程约4段"""
+    chunk = chunk or max(count // (4 * workers), 1)
+    return [np.arange(start, min(start + chunk, count), dtype=np.uint32) for start in range(0, count, chunk)]
+
+
+def _map_chunks(function, sbox, m, rows, count, workers, chunk):
+    """按段计算表的各行(workers > 1 且表足够大时用进程池), 结果写入 rows × count 的表"""
+    workers = workers or os.cpu_count()
+    chunks = _chunks(rows, workers, chunk)
+    table = np.empty((rows, count), dtype=np.int32)
+    if workers == 1 or len(chunks) == 1 or rows * count <= 1 << 16:
+        for masks in chunks:
+            table[masks] = function(sbox, m, masks)
+        return table
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for masks, part in zip(chunks, executor.map(function, [sbox] * len(chunks), [m] * len(chunks), chunks)):
+            table[masks] = part
+    return table
+
+
+def _walsh_rows(sbox, m, masks):
+    """分量函数 b·S 的Walsh谱, 每个输出掩码 b 一行: W[b, a] = Σ_x (-1)^(a·x ⊕ b·S(x))"""
+    signs = _parity(masks[:, None] & sbox[None, :])
+    values = (1 - 2 * signs.astype(np.int32))
+    return fast_walsh_hadamard_transform(values)
+
+
+def _ddt_rows(sbox, m, differences):
+    """输入差分 a 对应的各行: DDT[a, b] = #{x : S(x) ⊕ S(x⊕a) = b}"""
+    x = np.arange(sbox.size, dtype=np.uint32)
+    outputs = sbox[x[None, :] ^ differences[:, None]] ^ sbox[None, :]
+    rows = np.arange(differences.size, dtype=np.int64)[:, None] << m
+    counts = np.bincount((rows | outputs).ravel(), minlength=differences.size << m)
+    return counts.reshape(differences.size, 1 << m)
+
+
+def _bct_rows(sbox, m, differences):
+    """
+    输出差分 b 对应的各行(按 b 分行, 调用方转置): BCT[a, b] = #{x : u_b(x) = u_b(x⊕a)},
+    其中 u_b(x) = S^(-1)(S(x) ⊕ b) ⊕ x, 与定义 S^(-1)(S(x)⊕b) ⊕ S^(-1)(S(x⊕a)⊕b) = a 等价.
+    把 x 按 u_b(x) 排序后, u 值相同的 x 相邻, 只需比较相距 k 的元素(k 不超过最大的同值组长度),
+    每一行的代价是 O(2^n·组长) 而不是 O(2^n·2^n).
+    """
+    N = sbox.size
+    inverse = np.empty(N, dtype=np.uint32)
+    inverse[sbox] = np.arange(N, dtype=np.uint32)
+    x = np.arange(N, dtype=np.uint32)
+    table = np.empty((differences.size, N), dtype=np.int32)
+    for i, b in enumerate(differences):
+        u = inverse[sbox ^ b] ^ x
+        order = np.argsort(u, kind='stable')
+        u, xs = u[order], x[order]
+        row = np.zeros(N, dtype=np.int64)
+        row[0] = N
+        k = 1
+        while k < N:
+            same = u[k:] == u[:-k]
+            if not same.any():
+                break
+            # 无序对 {x, y} 对 a = x ⊕ y 贡献两次(x 和 y 各作一次起点)
+            row += 2 * np.bincount(xs[k:][same] ^ xs[:-k][same], minlength=N)
+            k += 1
+        table[i] = row
+    return table
+
+
+def linear_approximation_table(sbox, m=None, workers=None, chunk=None):
+    """
+    计算线性逼近表(LAT)
+
+    对全部 2^m 个输出掩码的分量函数做快速Walsh-Hadamard变换, 复杂度 O(2^m·n·2^n),
+    按输出掩码分段, workers > 1 时在进程池中并行计算.
+    参数:
+        sbox: 长度为 2^n 的查找表
+        m (int): 输出位数, 默认由最大输出值确定
+        workers (int): 工作进程数, 默认CPU核数, 为1时不启动进程池
+        chunk (int): 每段的输出掩码个数
+    返回:
+        2^n × 2^m 的 int32 数组, LAT[a, b] = Σ_x (-1)^(a·x ⊕ b·S(x))
+        (#{x : a·x = b·S(x)} - 2^(n-1) 的两倍; 与 compute_walsh_spectrum 对分量函数的结果相差一个符号)
+    """
+    n, m, sbox = parse_sbox(sbox, m)
+    return _map_chunks(_walsh_rows, sbox, m, 1 << m, 1 << n, workers, chunk).T.copy()
+
+
+def difference_distribution_table(sbox, m=None, workers=None, chunk=None):
+    """
+    计算差分分布表(DDT): 按输入差分分段, 每段用一次索引运算和 bincount 统计, 复杂度 O(2^n·2^n)
+
+    返回 2^n × 2^m 的 int32 数组, DDT[a, b] = #{x : S(x) ⊕ S(x⊕a) = b}.
+    """
+    n, m, sbox = parse_sbox(sbox, m)
+    return _map_chunks(_ddt_rows, sbox, m, 1 << n, 1 << m, workers, chunk)
+
+
+def boomerang_connectivity_table(sbox, workers=None, chunk=None):
+    """
+    计算回旋镖连接表(BCT), 只对置换(n = m 且为双射)有定义
+
+    返回 2^n × 2^n 的 int32 数组, BCT[a, b] = #{x : S^(-1)(S(x)⊕b) ⊕ S^(-1)(S(x⊕a)⊕b) = a}.
+    """
+    n, m, sbox = parse_sbox(sbox)
+    if not is_permutation(sbox):
+        raise ValueError("回旋镖连接表只对置换S盒有定义")
+    return _map_chunks(_bct_rows, sbox, n, 1 << n, 1 << n, workers, chunk).T.copy()
+
+
+def is_permutation(sbox):
+    """S盒是否为置换"""
+    sbox = np.asarray(sbox)
+    return bool(np.array_equal(np.sort(sbox), np.arange(sbox.size)))
+
+
+def linearity(lat):
+    """线性度: max |LAT[a, b]|, b ≠ 0"""
+    return int(np.abs(lat[:, 1:]).max()) if lat.shape[1] > 1 else 0
+
+
+def differential_uniformity(ddt):
+    """差分均匀度: max DDT[a, b], a ≠ 0"""
+    return int(ddt[1:].max()) if ddt.shape[0] > 1 else 0
+
+
+def boomerang_uniformity(bct):
+    """回旋镖均匀度: max BCT[a, b], a ≠ 0 且 b ≠ 0"""
+    return int(bct[1:, 1:].max()) if bct.shape[0] > 1 else 0
+
+
+def analyze_sbox(sbox, m=None, workers=None):
+    """
+    计算S盒的各项指标, 返回字典:
+        n, m, linearity, nonlinearity(2^(n-1) - 线性度/2), differential_uniformity,
+        boomerang_uniformity(非置换时为 None), 以及 lat, ddt, bct 三张表
+    """
+    n, m, sbox = parse_sbox(sbox, m)
+    lat = linear_approximation_table(sbox, m, workers)
+    ddt = difference_distribution_table(sbox, m, workers)
+    bct = boomerang_connectivity_table(sbox, workers) if n == m and is_permutation(sbox) else None
+    return {
+        'n': n,
+        'm': m,
+        'linearity': linearity(lat),
+        'nonlinearity': (1 << n) // 2 - linearity(lat) // 2,
+        'differential_uniformity': differential_uniformity(ddt),
+        'boomerang_uniformity': None if bct is None else boomerang_uniformity(bct),
+        'lat': lat,
+        'ddt': ddt,
+        'bct': bct,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="S盒线性逼近表、差分分布表与回旋镖连接表计算")
+    parser.add_argument("input", help="S盒查找表文件")
+    parser.add_argument("--hex", action="store_true", help="输出值全部按十六进制解析")
+    parser.add_argument("-m", "--output-bits", type=int, help="输出位数(默认由最大输出值确定)")
+    parser.add_argument("--workers", type=int, help="工作进程数(默认CPU核数)")
+    parser.add_argument("--save", help="把 LAT/DDT/BCT 保存到 .npz 文件")
+    args = parser.parse_args()
+
+    _, _, sbox = read_sbox_file(args.input, args.hex)
+    result = analyze_sbox(sbox, args.output_bits, args.workers)
+    print(f"输入位数: {result['n']}")
+    print(f"输出位数: {result['m']}")
+    print(f"线性度: {result['linearity']}")
+    print(f"非线性度: {result['nonlinearity']}")
+    print(f"差分均匀度: {result['differential_uniformity']}")
+    if result['bct'] is None:
+        print("回旋镖均匀度: S盒不是置换, 不计算")
+    else:
+        print(f"回旋镖均匀度: {result['boomerang_uniformity']}")
+
+    if args.save:
+        tables = {name: result[name] for name in ('lat', 'ddt', 'bct') if result[name] is not None}
+        np.savez(args.save, **tables)
+        print(f"各表已保存到 {args.save}")
+
+
+if __name__ == "__main__":
+    main()
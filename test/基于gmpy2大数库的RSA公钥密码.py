@@ -1,25 +1,302 @@
 import gmpy2
-from gmpy2 import mpz, random_state
+from gmpy2 import mpz
 import binascii
+import os
+import secrets
 import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import compress
+
+# 分块加密采用PKCS#1 v1.5加密填充: 0x00 0x02 PS 0x00 M, PS 为至少8个非零随机字节,
+# 每块明文最多 k - 11 字节(k 为模数n的字节数), 填充后的整数首字节为0, 一定小于n
+PADDING_OVERHEAD = 11
+
+# 每个进程池任务处理的块数
+BATCH_BLOCKS = 64
+
+# 筛选素数候选时试除的小素数上界; 每个随机窗口包含 SIEVE_WINDOW 个连续奇数
+SIEVE_BOUND = 1 << 16
+SIEVE_WINDOW = 1 << 11
+
+# Miller-Rabin 概率素性检验的轮数
+PRIME_TEST_ROUNDS = 25
+
+# 工作进程中的密钥, 由进程池的 initializer 设置一次, 之后的任务只传数据块
+_worker_key = None
+
+
+class RSAPrivateKey:
+    """
+    RSA私钥: 除 (n, d) 外保存 p, q 和中国剩余定理(CRT)所需的 dp = d mod (p-1), dq = d mod (q-1), qinv = q⁻¹ mod p
+    迭代、下标和 len 都按 (n, d) 处理，因此 n, d = private_key 和 private_key[0] 的写法和原来的元组私钥一样可用。
+    """
+
+    def __init__(self, n, e, d, p, q):
+        self.n, self.e, self.d = mpz(n), mpz(e), mpz(d)
+        self.p, self.q = mpz(p), mpz(q)
+        if self.p * self.q != self.n:
+            raise ValueError("p * q must equal n.")
+        self.dp = self.d % (self.p - 1)
+        self.dq = self.d % (self.q - 1)
+        self.qinv = gmpy2.invert(self.q, self.p)
+
+    def __iter__(self):
+        return iter((self.n, self.d))
+
+    def __getitem__(self, index):
+        return (self.n, self.d)[index]
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return f"RSAPrivateKey(n={self.n}, d={self.d})"
+
+    def decrypt_int(self, c, blinding=False):
+        """
+        用CRT计算 c^d mod n: 分别在模p、模q下做半长度的模幂，再用Garner公式合并
+            m1 = c^dp mod p, m2 = c^dq mod q, h = qinv·(m1 - m2) mod p, m = m2 + h·q
+        两次半长度模幂的代价约为一次全长度模幂的1/4。
+        blinding=True 时先把密文乘以 r^e（r为随机数），解密后再乘以 r⁻¹，使运算时间与密文无关，抵抗计时攻击。
+        """
+        c = mpz(c) % self.n
+        if blinding:
+            while True:
+                r = mpz(secrets.randbelow(int(self.n) - 2) + 2)
+                if gmpy2.gcd(r, self.n) == 1:
+                    break
+            c = c * gmpy2.powmod(r, self.e, self.n) % self.n
+        m1 = gmpy2.powmod(c, self.dp, self.p)
+        m2 = gmpy2.powmod(c, self.dq, self.q)
+        h = self.qinv * (m1 - m2) % self.p
+        m = m2 + h * self.q
+        if blinding:
+            m = m * gmpy2.invert(r, self.n) % self.n
+        return m
+
+
+def _pad(block, k):
+    """PKCS#1 v1.5 加密填充, 返回 k 字节"""
+    length = k - 3 - len(block)
+    ps = b''
+    while len(ps) < length:
+        ps += os.urandom(length - len(ps)).replace(b'\x00', b'')
+    return b'\x00\x02' + ps + b'\x00' + block
+
+
+def _unpad(padded):
+    """去掉PKCS#1 v1.5加密填充"""
+    separator = padded.find(b'\x00', 2)
+    if padded[:2] != b'\x00\x02' or separator < 2 + 8:
+        raise ValueError("Decryption error: invalid padding.")
+    return padded[separator + 1:]
+
+
+def _decrypt_int(private_key, c):
+    if isinstance(private_key, RSAPrivateKey):
+        return private_key.decrypt_int(c)
+    n, d = private_key
+    return gmpy2.powmod(c, d, n)
+
+
+def _init_worker(key):
+    global _worker_key
+    _worker_key = key
+
+
+def _encrypt_chunk(chunk):
+    """用 _worker_key 中的公钥加密一段明文: 按 k - 11 字节分块、填充, 每块密文固定 k 字节"""
+    n, e = _worker_key
+    k = (n.bit_length() + 7) // 8
+    size = k - PADDING_OVERHEAD
+    out = []
+    for start in range(0, len(chunk), size):
+        m = mpz(int.from_bytes(_pad(chunk[start:start + size], k), byteorder='big'))
+        out.append(gmpy2.powmod(m, e, n).to_bytes(k, byteorder='big'))
+    return b''.join(out)
+
+
+def _decrypt_chunk(chunk):
+    """用 _worker_key 中的私钥解密一段由整块组成的密文"""
+    n, _ = _worker_key
+    k = (n.bit_length() + 7) // 8
+    if len(chunk) % k:
+        raise ValueError("Ciphertext length is not a multiple of the modulus size.")
+    out = []
+    for start in range(0, len(chunk), k):
+        c = mpz(int.from_bytes(chunk[start:start + k], byteorder='big'))
+        if c >= n:
+            raise ValueError("Ciphertext block is not smaller than n.")
+        out.append(_unpad(_decrypt_int(_worker_key, c).to_bytes(k, byteorder='big')))
+    return b''.join(out)
+
+
+def _map_chunks(function, key, chunks, workers=None, max_in_flight=None):
+    """
+    按顺序产生 function(chunk) 的结果; workers 为1时在本进程中计算,
+    否则在进程池中计算, 密钥只通过 initializer 传给每个工作进程一次, 同时在途的任务不超过 max_in_flight
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        _init_worker(key)
+        for chunk in chunks:
+            yield function(chunk)
+        return
+    limit = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(key,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _read_chunks(src, chunk_size):
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _split(data, chunk_size):
+    return (data[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+
+
+def _block_sizes(key):
+    """(每块明文字节数, 每块密文字节数)"""
+    n, _ = key
+    k = (int(n).bit_length() + 7) // 8
+    if k <= PADDING_OVERHEAD:
+        raise ValueError("Modulus is too small for block padding.")
+    return k - PADDING_OVERHEAD, k
+
+
+def _small_primes(bound):
+    """埃拉托斯特尼筛法求 3 ≤ q < bound 的素数"""
+    flags = bytearray([1]) * bound
+    flags[:2] = b'\x00\x00'
+    for i in range(2, int(bound ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, bound, i)))
+    return list(compress(range(3, bound), flags[3:]))
+
+
+SMALL_PRIMES = _small_primes(SIEVE_BOUND)
+
+
+def sieve_candidates(bits, window=SIEVE_WINDOW):
+    """
+    随机取一个最高两位为1的 bits 位奇数 base, 对 base, base+2, ..., base+2(window-1) 一次性用小素数表筛选
+    对每个小素数q只需算一次 base mod q, 就能把窗口中所有q的倍数划掉(字节数组的切片赋值),
+    返回剩下的、恰好 bits 位的候选数。最高两位为1保证两个这样的素数之积恰好 2·bits 位。
+    """
+    if bits < 32:
+        raise ValueError("Prime size must be at least 32 bits.")
+    base = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+    flags = bytearray([1]) * window
+    zeros = bytes(window)
+    for q in SMALL_PRIMES:
+        # base + 2i ≡ 0 (mod q) ⇔ i ≡ -base·2⁻¹ (mod q)
+        i = -(base % q) * ((q + 1) // 2) % q
+        if i < window:
+            flags[i::q] = zeros[:(window - 1 - i) // q + 1]
+    limit = 1 << bits
+    return [mpz(c) for c in (base + 2 * i for i in compress(range(window), flags)) if c < limit]
+
+
+def _first_prime(candidates):
+    """按顺序对候选数做概率素性检验, 返回第一个(概率)素数, 没有时返回None"""
+    for c in candidates:
+        if gmpy2.is_prime(c, PRIME_TEST_ROUNDS):
+            return c
+    return None
+
+
+def generate_primes(bits, count, workers=None, window=SIEVE_WINDOW, max_in_flight=None):
+    """
+    产生 count 个恰好 bits 位的随机素数
+    本进程筛选随机窗口, 把各窗口的候选数交给进程池做素性检验(开销主要在这里);
+    每个窗口最多取一个素数(即窗口中第一个素数), 因此不会产生相距很近的两个素数。
+    workers 为1时不启动进程池; 生成器提前关闭时取消尚未开始的任务
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        while count:
+            p = _first_prime(sieve_candidates(bits, window))
+            if p is not None:
+                count -= 1
+                yield p
+        return
+    limit = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(_first_prime, sieve_candidates(bits, window)) for _ in range(limit)}
+        try:
+            while True:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    p = future.result()
+                    if p is not None:
+                        count -= 1
+                        yield p
+                        if not count:
+                            return
+                    pending.add(executor.submit(_first_prime, sieve_candidates(bits, window)))
+        finally:
+            for other in pending:
+                other.cancel()
+
+
+def generate_key_pairs(key_size, count, workers=None):
+    """
+    批量产生 count 个 key_size 位的RSA密钥对 ((n, e), RSAPrivateKey), 所有素数由同一个进程池并行生成
+    """
+    p_bits = key_size // 2
+    q_bits = key_size - p_bits
+    if p_bits == q_bits:
+        primes = generate_primes(p_bits, 2 * count, workers)
+        pairs = zip(primes, primes)
+    else:
+        pairs = zip(list(generate_primes(p_bits, count, workers)), generate_primes(q_bits, count, workers))
+    for p, q in pairs:
+        yield RSA.key_pair_from_primes(p, q)
+
+
+def benchmark_key_generation(key_size=2048, count=8, workers=None):
+    """测量批量生成密钥对的速率(个/秒)"""
+    start = time.perf_counter()
+    keys = list(generate_key_pairs(key_size, count, workers))
+    elapsed = time.perf_counter() - start
+    assert all(int(public_key[0]).bit_length() == key_size for public_key, _ in keys)
+    print(f"{key_size} 位密钥对 {count} 个: {elapsed:.2f} 秒, {count / elapsed:.2f} 个/秒")
 
 
 class RSA:
-    def __init__(self, key_size=1024):
+    def __init__(self, key_size=1024, workers=1):
+        """workers: 生成素数的工作进程数; 只生成一个密钥对时在本进程中计算最快, 批量生成见 generate_key_pairs"""
         self.key_size = key_size
-        self.rs = random_state()
+        self.workers = workers
 
     def generate_keys(self):
-        # 生成两个大素数p和q
-        p = gmpy2.next_prime(gmpy2.mpz_urandomb(self.rs, self.key_size // 2))
-        q = gmpy2.next_prime(gmpy2.mpz_urandomb(self.rs, self.key_size // 2))
+        # 生成两个大素数p和q, 并由它们计算密钥对
         """
-        gmpy2.mpz_urandomb(self.rs, self.key_size // 2):
-        生成一个均匀随机的大整数，其比特长度最多为 self.key_size / 2, 当key_size=1024时，生成的比特长度为512
-        
-        gmpy2.next_prime()：
-        找到比该随机数大的下一个素数。
+        generate_key_pairs(key_size, 1)：
+        随机取一个最高两位为1的 key_size/2 位奇数，对它之后的一段奇数用小素数表筛掉合数，
+        再对剩下的候选数做概率素性检验，取第一个素数；p、q 由同一次 generate_primes 调用产生，
+        都恰好 key_size/2 位，n 恰好 key_size 位。
         """
+        (key_pair,) = generate_key_pairs(self.key_size, 1, self.workers)
+        return key_pair
+
+    @staticmethod
+    def key_pair_from_primes(p, q):
+        """由两个不同的素数p、q计算公钥(n, e)和私钥"""
+        if p == q:
+            raise ValueError("p and q must be distinct primes.")
 
         # 计算n = p * q
         n = p * q
@@ -48,8 +325,8 @@ class RSA:
         d = gmpy2.invert(e, phi)
         """gmpy2.invert(e, phi) 是 模逆元（Modular Inverse） 的计算函数"""
 
-        # 返回公钥(n, e)和私钥(n, d)
-        return (n, e), (n, d)
+        # 返回公钥(n, e)和私钥；私钥保存p、q以便用CRT解密，仍可按 (n, d) 解包
+        return (n, e), RSAPrivateKey(n, e, d, p, q)
 
     def encrypt(self, public_key, plaintext):
         n, e = public_key
@@ -66,15 +343,24 @@ class RSA:
         """
 
         # 验证明文长度是否超过n的长度
+        if m >= n:
+            raise ValueError("Plaintext is too long for the modulus; use encrypt_blocks for long messages.")
         # 加密: c = m^e mod n
         c = gmpy2.powmod(m, e, n)
         return c
 
-    def decrypt(self, private_key, ciphertext):
-        n, d = private_key
-        # 解密: m = c^d mod n
-        m = gmpy2.powmod(ciphertext, d, n)
-        """gmpy2.powmod(c, d, n)：高效计算 c^d mod n，即用私钥 d 解密密文 c。"""
+    def decrypt(self, private_key, ciphertext, blinding=False):
+        """
+        private_key 可以是 RSAPrivateKey（用CRT解密，blinding=True 时启用盲化），
+        也可以是原来的 (n, d) 元组（直接做全长度模幂）
+        """
+        if isinstance(private_key, RSAPrivateKey):
+            m = private_key.decrypt_int(ciphertext, blinding)
+        else:
+            n, d = private_key
+            # 解密: m = c^d mod n
+            m = gmpy2.powmod(ciphertext, d, n)
+            """gmpy2.powmod(c, d, n)：高效计算 c^d mod n，即用私钥 d 解密密文 c。"""
 
         # 将整数转换回字节
         """
@@ -93,6 +379,59 @@ class RSA:
         except:
             return plaintext
 
+    def encrypt_blocks(self, public_key, plaintext, workers=None):
+        """
+        分块加密任意长度的消息: 每 k - 11 字节一块做PKCS#1 v1.5填充后加密, 密文为各块 k 字节密文的拼接
+        workers 为工作进程数(默认CPU核数), 为1时不启动进程池
+        """
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
+        size, _ = _block_sizes(public_key)
+        chunks = _split(plaintext, size * BATCH_BLOCKS)
+        return b''.join(_map_chunks(_encrypt_chunk, public_key, chunks, workers))
+
+    def decrypt_blocks(self, private_key, ciphertext, workers=None):
+        """解密 encrypt_blocks 的结果, 返回字节串"""
+        _, k = _block_sizes(private_key)
+        chunks = _split(ciphertext, k * BATCH_BLOCKS)
+        return b''.join(_map_chunks(_decrypt_chunk, private_key, chunks, workers))
+
+    def encrypt_file(self, public_key, in_path, out_path, workers=None, max_in_flight=None):
+        """流式分块加密文件, 内存占用只与在途的任务数有关, 与文件大小无关"""
+        size, _ = _block_sizes(public_key)
+        with open(in_path, 'rb') as src, open(out_path, 'wb') as out:
+            for part in _map_chunks(_encrypt_chunk, public_key, _read_chunks(src, size * BATCH_BLOCKS),
+                                    workers, max_in_flight):
+                out.write(part)
+
+    def decrypt_file(self, private_key, in_path, out_path, workers=None, max_in_flight=None):
+        """流式分块解密文件"""
+        _, k = _block_sizes(private_key)
+        with open(in_path, 'rb') as src, open(out_path, 'wb') as out:
+            for part in _map_chunks(_decrypt_chunk, private_key, _read_chunks(src, k * BATCH_BLOCKS),
+                                    workers, max_in_flight):
+                out.write(part)
+
+
+def benchmark(key_sizes=(1024, 2048, 3072), size=1 << 18, workers=None):
+    """测量不同密钥长度下分块加密和解密的吞吐率(KB/s)"""
+    data = os.urandom(size)
+    for key_size in key_sizes:
+        rsa = RSA(key_size)
+        public_key, private_key = rsa.generate_keys()
+
+        start = time.perf_counter()
+        ciphertext = rsa.encrypt_blocks(public_key, data, workers)
+        encrypt_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = rsa.decrypt_blocks(private_key, ciphertext, workers)
+        decrypt_time = time.perf_counter() - start
+        assert restored == data
+
+        print(f"{key_size} 位密钥, {size // 1024} KB: 加密 {size / 1024 / encrypt_time:.1f} KB/s, "
+              f"解密 {size / 1024 / decrypt_time:.1f} KB/s")
+
 
 def main():
     # 初始化RSA实例，使用2048位密钥
@@ -101,7 +440,7 @@ def main():
     # 生成密钥对
     public_key, private_key = rsa.generate_keys()
     print(f"公钥 (n, e): {public_key}")
-    print(f"私钥 (n, d): {private_key}")
+    print(f"私钥 (n, d): {tuple(private_key)}")
 
     # 要加密的消息
     message = "这是一条使用RSA加密的测试消息。Hello RSA!"
@@ -121,6 +460,22 @@ def main():
     else:
         print("\n验证失败!")
 
+    # 原有的 (n, d) 元组私钥和盲化的CRT解密应得到相同结果
+    assert rsa.decrypt(tuple(private_key), ciphertext) == decrypted
+    assert rsa.decrypt(private_key, ciphertext, blinding=True) == decrypted
+
+    # 分块加密任意长度的消息
+    long_message = (message * 100).encode('utf-8')
+    blocks = rsa.encrypt_blocks(public_key, long_message)
+    assert rsa.decrypt_blocks(private_key, blocks) == long_message
+    print(f"\n分块加密 {len(long_message)} 字节的消息得到 {len(blocks)} 字节密文, 解密验证成功")
+
+    print()
+    benchmark()
+
+    print()
+    benchmark_key_generation()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,15 +1,342 @@
+import hashlib
 import math
-from typing import Optional
+import os
+import random
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+from sympy import factorint
 
-def shanks_algorithm(g: int, h: int, p: int) -> Optional[int]:
+# 每批计算和查找的giant-step个数
+GIANT_STEP_BATCH = 1 << 16
+
+# Pohlig-Hellman子问题的素数阶超过该值时改用Pollard rho(baby-step表约需 16·√q 字节)
+RHO_THRESHOLD = 1 << 44
+
+
+def _powers(base: int, start: int, count: int, p: int) -> np.ndarray:
+    """
+    计算 start * base^k mod p (0 ≤ k < count), 返回 uint64 数组
+
+    p < 2^32 时两个剩余的乘积不超过 2^64, 按块倍增向量化计算; 否则逐个用Python整数计算.
+    p ≥ 2^64 时只保留低64位作为查找键, 匹配后需要再核对完整的值.
+    """
+    if p >= 1 << 32:
+        result = np.empty(count, dtype=np.uint64)
+        current = start % p
+        for k in range(count):
+            result[k] = current & 0xFFFFFFFFFFFFFFFF
+            current = current * base % p
+        return result
+
+    modulus = np.uint64(p)
+    result = np.empty(count, dtype=np.uint64)
+    if count == 0:
+        return result
+    result[0] = start % p
+    filled, step = 1, base % p
+    while filled < count:
+        size = min(filled, count - filled)
+        np.multiply(result[:size], np.uint64(step), out=result[filled:filled + size])
+        result[filled:filled + size] %= modulus
+        filled += size
+        step = step * step % p
+    return result
+
+
+def _build_baby_steps(g: int, p: int, m: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Baby-step表: g^j mod p (0 ≤ j < m) 排序后的值数组和对应的指数数组
+
+    每项只占16字节(两个 uint64), 值相同的项按 j 从小到大排列, 查找时取第一个即最小的 j.
+    """
+    values = _powers(g, 1, m, p)
+    order = np.argsort(values, kind='stable')
+    return values[order], order.astype(np.uint64)
+
+
+def _giant_steps(g: int, h: int, factor: int, p: int, count: int, values: np.ndarray, exponents: np.ndarray,
+                 batch_size: int = GIANT_STEP_BATCH) -> Optional[Tuple[int, int]]:
+    """
+    依次检查 h * factor^i mod p (0 ≤ i < count) 是否在 g 的baby-step表中
+
+    每批用一次 searchsorted 查找, 返回第一个匹配的 (i, j), 没有匹配时返回None.
+    """
+    current = h % p
+    stride = pow(factor, batch_size, p)
+    for first in range(0, count, batch_size):
+        batch = _powers(factor, current, min(batch_size, count - first), p)
+        index = np.searchsorted(values, batch)
+        index[index == values.size] = 0
+        for k in np.flatnonzero(values[index] == batch).tolist():
+            j = int(exponents[index[k]])
+            # 表中只存低64位时, 键相同不一定值相同
+            if p < 1 << 64 or current * pow(factor, k, p) % p == pow(g, j, p):
+                return first + k, j
+        current = current * stride % p
+    return None
+
+
+def baby_step_giant_step(g: int, h: int, p: int, order: Optional[int] = None,
+                         baby_steps: Optional[int] = None) -> Optional[int]:
+    """
+    不输出过程的Baby-step Giant-step算法, 求 0 ≤ x < order 且 g^x ≡ h mod p 的最小x
+
+    参数:
+        order (int): x 的上界(通常为 g 的阶), 默认 p-1
+        baby_steps (int): baby-step表的项数, 默认 ⌈√order⌉. 内存约为 16·baby_steps 字节,
+            giant-step的次数约为 order/baby_steps, 内存不足时可以调小它以时间换空间
+    """
+    h %= p
+    if h == 0:
+        return None
+    if order is None:
+        order = p - 1
+    if g % p == 1:
+        return 0 if h == 1 else None
+    m = baby_steps or math.isqrt(order - 1) + 1
+    m = max(1, min(m, order))
+
+    values, exponents = _build_baby_steps(g, p, m)
+    match = _giant_steps(g, h, pow(g, -m, p), p, -(-order // m), values, exponents)
+    if match is None:
+        return None
+    i, j = match
+    x = i * m + j
+    return x if x < order else None
+
+
+class BabyStepTable:
+    """
+    可重复使用的baby-step表, 对同一 (g, p) 批量求解多个离散对数
+
+    表由 (g, p, m) 唯一确定, 指定 cache_dir 时排序后的值数组和指数数组保存为 .npy 文件,
+    之后以内存映射方式打开, 不必重新计算. 每个对数的代价只剩giant-step阶段;
+    p < 2^32 时多个目标的giant-step合成一个矩阵向量化计算.
+    """
+
+    def __init__(self, g: int, p: int, m: Optional[int] = None, order: Optional[int] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        参数:
+            g (int): 底数
+            p (int): 素数模数
+            m (int): baby-step表的项数, 默认 ⌈√order⌉
+            order (int): 解 x 的上界(通常为 g 的阶), 默认 p-1
+            cache_dir (str): 表文件所在目录, 为None时只在内存中建表
+        """
+        self.g = g % p
+        self.p = p
+        self.order = order or p - 1
+        self.m = max(1, min(m or math.isqrt(self.order - 1) + 1, self.order))
+        self.giant_steps = -(-self.order // self.m)
+        self._factor = pow(self.g, -self.m, p)
+        self.values, self.exponents = self._load(cache_dir)
+
+    def _load(self, cache_dir):
+        if cache_dir is None:
+            return _build_baby_steps(self.g, self.p, self.m)
+        key = hashlib.sha256(f"{self.g},{self.p},{self.m}".encode()).hexdigest()[:24]
+        prefix = os.path.join(cache_dir, f"bsgs_{key}")
+        paths = prefix + ".values.npy", prefix + ".exponents.npy"
+        if not all(os.path.exists(path) for path in paths):
+            os.makedirs(cache_dir, exist_ok=True)
+            for path, array in zip(paths, _build_baby_steps(self.g, self.p, self.m)):
+                # 先写临时文件再改名, 并发建表或中途退出都不会留下不完整的表
+                temporary = f"{path}.{os.getpid()}.tmp.npy"
+                np.save(temporary, array)
+                os.replace(temporary, path)
+        values, exponents = (np.load(path, mmap_mode='r') for path in paths)
+        if values.shape != (self.m,) or exponents.shape != (self.m,):
+            raise ValueError(f"表文件 {prefix} 与参数不符")
+        return values, exponents
+
+    def solve(self, h: int) -> Optional[int]:
+        """求 0 ≤ x < order 且 g^x ≡ h mod p 的最小x, 不存在时返回None"""
+        return self.solve_many([h])[0]
+
+    def solve_many(self, targets, batch_size: int = GIANT_STEP_BATCH) -> List[Optional[int]]:
+        """批量求解, 返回与 targets 对应的解列表"""
+        targets = [h % self.p for h in targets]
+        results: List[Optional[int]] = [None] * len(targets)
+        if self.g == 1:
+            return [0 if h == 1 else None for h in targets]
+        if self.p >= 1 << 32:
+            for k, h in enumerate(targets):
+                if h:
+                    results[k] = self._result(_giant_steps(self.g, h, self._factor, self.p, self.giant_steps,
+                                                           self.values, self.exponents, batch_size))
+            return results
+
+        remaining = np.array([k for k, h in enumerate(targets) if h], dtype=np.int64)
+        current = np.array([targets[k] for k in remaining], dtype=np.uint64)
+        modulus = np.uint64(self.p)
+        first = 0
+        while remaining.size and first < self.giant_steps:
+            # 每行一个目标, 每列一个giant-step: current · factor^i
+            columns = min(max(1, batch_size // remaining.size), self.giant_steps - first)
+            steps = _powers(self._factor, 1, columns + 1, self.p)
+            batch = current[:, None] * steps[None, :columns] % modulus
+            index = np.searchsorted(self.values, batch)
+            index[index == self.m] = 0
+            hits = np.asarray(self.values)[index] == batch
+            found = hits.any(axis=1)
+            for row in np.flatnonzero(found):
+                i = int(hits[row].argmax())
+                j = int(self.exponents[index[row, i]])
+                results[remaining[row]] = self._result((first + i, j))
+            remaining, current = remaining[~found], current[~found] * steps[columns] % modulus
+            first += columns
+        return results
+
+    def _result(self, match):
+        if match is None:
+            return None
+        i, j = match
+        x = i * self.m + j
+        return x if x < self.order else None
+
+
+def _crt(residues, moduli) -> Tuple[int, int]:
+    """中国剩余定理合并 x ≡ r_i mod m_i(模两两互素), 返回 (x, Π m_i)"""
+    x, modulus = 0, 1
+    for r, m in zip(residues, moduli):
+        t = (r - x) * pow(modulus, -1, m) % m
+        x += modulus * t
+        modulus *= m
+    return x, modulus
+
+
+def multiplicative_order(g: int, p: int, factorization: Optional[Dict[int, int]] = None) -> int:
+    """
+    g 模 p 的乘法阶
+
+    参数:
+        factorization (dict): p-1 的分解 {素数: 指数}, 默认用 sympy.factorint 计算
+    """
+    if factorization is None:
+        factorization = factorint(p - 1)
+    order = p - 1
+    for q in factorization:
+        while order % q == 0 and pow(g, order // q, p) == 1:
+            order //= q
+    return order
+
+
+def pollard_rho_prime_order(g: int, h: int, p: int, q: int) -> Optional[int]:
+    """
+    Pollard rho 求 g^x ≡ h mod p, 其中 g 的阶为素数 q; 常数内存, 期望约 √q 步
+
+    随机游走 y = g^a·h^b 按 y mod 3 分为乘g、乘h、平方三类, 用Floyd判圈找碰撞
+    g^a1·h^b1 = g^a2·h^b2, 于是 x = (a1-a2)/(b2-b1) mod q. 碰撞退化(b1 = b2)时换随机起点重试.
+    h 不在 g 生成的子群中时返回None.
+    """
+    h %= p
+    if pow(h, q, p) != 1:
+        return None
+    if h == 1:
+        return 0
+
+    def step(y, a, b):
+        r = y % 3
+        if r == 0:
+            return y * g % p, (a + 1) % q, b
+        if r == 1:
+            return y * h % p, a, (b + 1) % q
+        return y * y % p, 2 * a % q, 2 * b % q
+
+    while True:
+        a, b = random.randrange(q), random.randrange(q)
+        y = pow(g, a, p) * pow(h, b, p) % p
+        tortoise, hare = (y, a, b), step(y, a, b)
+        while tortoise[0] != hare[0]:
+            tortoise = step(*tortoise)
+            hare = step(*step(*hare))
+        _, a1, b1 = tortoise
+        _, a2, b2 = hare
+        if (b2 - b1) % q:
+            return (a1 - a2) * pow(b2 - b1, -1, q) % q
+
+
+def _solve_prime_order(g: int, h: int, p: int, q: int) -> Optional[int]:
+    """阶为素数 q 的子群中求对数: q 较小时用不输出过程的BSGS, 否则用Pollard rho"""
+    if q <= RHO_THRESHOLD:
+        return baby_step_giant_step(g, h, p, order=q)
+    return pollard_rho_prime_order(g, h, p, q)
+
+
+def _solve_prime_power(g: int, h: int, p: int, q: int, e: int, solver=_solve_prime_order) -> Optional[int]:
+    """
+    g 的阶为 q^e 时求 x mod q^e: 逐位求 x 的 q 进制数字, 每一位是阶为 q 的子群中的一个对数,
+    由 solver(g, h, p, q) 求解
+    """
+    gamma = pow(g, q ** (e - 1), p)
+    g_inv = pow(g, -1, p)
+    x = 0
+    for k in range(e):
+        target = pow(h * pow(g_inv, x, p) % p, q ** (e - 1 - k), p)
+        digit = solver(gamma, target, p, q)
+        if digit is None:
+            return None
+        x += digit * q ** k
+    return x
+
+
+def pohlig_hellman(g: int, h: int, p: int, factorization: Optional[Dict[int, int]] = None,
+                   solver=None) -> Optional[int]:
+    """
+    Pohlig-Hellman算法求解离散对数 g^x ≡ h mod p, 返回最小非负解x, 无解时返回None
+
+    先求 g 的阶 n, 对 n 的每个素数幂因子 q^e 在阶为 q^e 的子群中求 x mod q^e,
+    再用中国剩余定理合并. 总代价约为 Σ e·√q, p-1 光滑时远小于 √p.
+    参数:
+        factorization (dict): 已知的 p-1 分解 {素数: 指数}, 默认用 sympy.factorint 计算
+        solver: 素数阶子群中的求解函数 solver(g, h, p, q), 默认按 q 的大小选用BSGS或Pollard rho
+    """
+    if factorization is None:
+        factorization = factorint(p - 1)
+    if solver is None:
+        solver = _solve_prime_order
+    if math.prod(q ** e for q, e in factorization.items()) != p - 1:
+        raise ValueError("给定的分解与 p-1 不符")
+    h %= p
+    if h == 0:
+        return None
+
+    n = multiplicative_order(g, p, factorization)
+    if pow(h, n, p) != 1:
+        return None
+
+    residues, moduli = [], []
+    for q in sorted(factorization):
+        e = 0
+        while n % q ** (e + 1) == 0:
+            e += 1
+        if e == 0:
+            continue
+        cofactor = n // q ** e
+        x = _solve_prime_power(pow(g, cofactor, p), pow(h, cofactor, p), p, q, e, solver)
+        if x is None:
+            return None
+        residues.append(x)
+        moduli.append(q ** e)
+    return _crt(residues, moduli)[0]
+
+
+def shanks_algorithm(g: int, h: int, p: int, verbose: bool = True, baby_steps: Optional[int] = None) -> Optional[int]:
     """
     Shanks' Baby-step Giant-step算法求解离散对数 g^x ≡ h mod p
     返回满足条件的最小非负整数x，若不存在则返回None
+
+    verbose=False 时不输出过程, 改用 baby_step_giant_step(排序数组存表、批量查找),
+    baby_steps 为其表项数(见 baby_step_giant_step).
     """
     if g == 1:
         return 0 if h == 1 else None
 
+    if not verbose:
+        return baby_step_giant_step(g, h, p, baby_steps=baby_steps)
+
     # 计算步长m = ⌈√p⌉
     m = math.isqrt(p) + 1
 
@@ -67,6 +394,22 @@ def test_discrete_log():
     x = shanks_algorithm(g, h, p)
     print(f"解：x = {x}")
 
+    # 示例4：不输出过程的较大参数
+    g, h, p = 5, 123456789, 1000000007
+    print(f"\n=== 测试4：求解 {g}^x ≡ {h} mod {p} (不输出过程) ===")
+    x = shanks_algorithm(g, h, p, verbose=False)
+    print(f"解：x = {x}, 验证 {g}^{x} mod {p} = {pow(g, x, p)}")
+
+    # 示例5：p-1 光滑的66位素数, 用Pohlig-Hellman算法
+    p = 71408671968122138087
+    g, h = 5, 1234567890123456789
+    print(f"\n=== 测试5：求解 {g}^x ≡ {h} mod {p} (Pohlig-Hellman) ===")
+    x = pohlig_hellman(g, h, p)
+    if x is None:
+        print("离散对数不存在")
+    else:
+        print(f"解：x = {x}, 验证 {g}^{x} mod {p} = {pow(g, x, p)}")
+
 
 if __name__ == "__main__":
     test_discrete_log()
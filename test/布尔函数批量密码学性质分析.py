@@ -0,0 +1,142 @@
+import argparse
+import csv
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from 布尔函数谱值计算程序 import fast_walsh_hadamard_transform
+
+RESULT_DTYPE = np.dtype([
+    ('nonlinearity', np.int64),
+    ('max_walsh', np.int64),
+    ('balanced', np.bool_),
+    ('correlation_immunity', np.int8),
+    ('resiliency', np.int8),
+])
+
+
+def analyze_truth_tables(tables):
+    """
+    批量分析布尔函数的密码学性质
+
+    参数:
+        tables: M × 2^n 的 0/1 数组, 每行是一个函数的真值向量
+    返回:
+        长度为 M 的结构化数组, 字段为
+        nonlinearity(非线性度 2^(n-1) - max|W|/2), max_walsh(max|W(w)|), balanced(W(0) = 0),
+        correlation_immunity(相关免疫阶: 对所有 1 ≤ wt(w) ≤ m 有 W(w) = 0 的最大 m),
+        resiliency(弹性阶: 平衡时等于相关免疫阶, 否则为 -1)
+    所有性质都由同一次二维快速Walsh-Hadamard变换得到.
+    """
+    tables = np.asarray(tables)
+    if tables.ndim != 2:
+        raise ValueError("真值表数组必须是二维的(每行一个函数)")
+    N = tables.shape[1]
+    if N == 0 or N & (N - 1):
+        raise ValueError(f"真值向量长度必须是2的幂, 但得到的是{N}")
+    n = N.bit_length() - 1
+    dtype = np.int32 if n <= 30 else np.int64
+
+    if tables.size and (tables.min() < 0 or tables.max() > 1):
+        raise ValueError("真值表只能包含0和1")
+    # 先在 int8 中得到 ±1, 再转换为变换所需的整数类型
+    spectrum = (1 - 2 * tables.astype(np.int8)).astype(dtype)
+    fast_walsh_hadamard_transform(spectrum)
+
+    result = np.empty(tables.shape[0], dtype=RESULT_DTYPE)
+    max_walsh = np.abs(spectrum).max(axis=1)
+    result['max_walsh'] = max_walsh
+    result['nonlinearity'] = N // 2 - max_walsh // 2
+    result['balanced'] = spectrum[:, 0] == 0
+
+    # 非零谱值所在位置的最小汉明重量减1就是相关免疫阶(w = 0 不计入; 常值函数记为 n)
+    weights = np.array([bin(w).count('1') for w in range(N)], dtype=np.int8)
+    masked = np.where(spectrum != 0, weights, np.int8(n + 1))
+    masked[:, 0] = n + 1
+    result['correlation_immunity'] = masked.min(axis=1) - 1
+    result['resiliency'] = np.where(result['balanced'], result['correlation_immunity'], -1)
+    return result
+
+
+def iter_table_batches(filename, batch_size):
+    """
+    按批读取真值表文件
+
+    .npy 文件为 M × 2^n 的 0/1 数组(以内存映射方式读取);
+    其他文件按文本读取, 每行一个真值向量(0/1字符, 允许空格), 空行跳过.
+    """
+    if filename.endswith('.npy'):
+        tables = np.load(filename, mmap_mode='r')
+        for start in range(0, tables.shape[0], batch_size):
+            yield np.asarray(tables[start:start + batch_size])
+        return
+
+    batch, width = [], None
+    with open(filename, 'r', encoding='ascii') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip().replace(' ', '')
+            if not line:
+                continue
+            row = np.frombuffer(line.encode('ascii'), dtype=np.uint8) - ord('0')
+            if row.max() > 1:
+                raise ValueError(f"第{number}行: 真值向量只能包含0和1")
+            if width is None:
+                width = row.size
+            elif row.size != width:
+                raise ValueError(f"第{number}行: 真值向量长度为{row.size}, 与第一行的{width}不同")
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield np.stack(batch)
+                batch = []
+    if batch:
+        yield np.stack(batch)
+
+
+def analyze_file(filename, batch_size=1024, workers=None, max_in_flight=None):
+    """
+    用进程池并行分析文件中的全部真值表, 按原顺序逐批产生结果数组
+
+    同时在途的批次数不超过 max_in_flight(默认工作进程数的两倍), 内存占用与文件大小无关.
+    """
+    workers = workers or os.cpu_count()
+    limit = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in iter_table_batches(filename, batch_size):
+            pending.append(executor.submit(analyze_truth_tables, batch))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="布尔函数密码学性质批量分析")
+    parser.add_argument("input", help="真值表文件: 每行一个真值向量的文本文件, 或 M×2^n 的 .npy 数组")
+    parser.add_argument("-o", "--output", required=True, help="结果文件, 扩展名为 .npy 时保存结构化数组, 否则写CSV")
+    parser.add_argument("--batch-size", type=int, default=1024, help="每批函数个数")
+    parser.add_argument("--workers", type=int, help="工作进程数(默认CPU核数)")
+    args = parser.parse_args()
+
+    results = analyze_file(args.input, args.batch_size, args.workers)
+    count = 0
+    if args.output.endswith('.npy'):
+        collected = list(results)
+        table = np.concatenate(collected) if collected else np.empty(0, dtype=RESULT_DTYPE)
+        np.save(args.output, table)
+        count = table.shape[0]
+    else:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('index',) + RESULT_DTYPE.names)
+            for batch in results:
+                for row in batch.tolist():
+                    writer.writerow((count,) + tuple(int(x) for x in row))
+                    count += 1
+    print(f"已分析 {count} 个布尔函数, 结果保存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from 布尔函数谱值计算程序 import fast_walsh_hadamard_transform
+
+# 打包真值表文件格式: 2^n 个函数值按下标顺序每8个打包成一个字节, 字节内高位在前
+# (与 np.packbits 默认顺序相同), 文件长度为 2^n / 8 字节, 由文件长度即可确定 n (n ≥ 3).
+# 十六进制格式就是打包字节的十六进制文本, 可以有空白.
+
+
+def pack_config_file(config_file, packed_file, chunk_size=1 << 24):
+    """把原有的文本配置文件(第一行 n, 第二行真值向量)流式转换为打包格式, 返回 n"""
+    with open(config_file, 'rb') as src, open(packed_file, 'wb') as dst:
+        n = int(src.readline().strip())
+        if n < 3:
+            raise ValueError(f"打包格式要求变元个数至少为3, 但得到的是{n}")
+        pending = np.empty(0, dtype=np.uint8)
+        count = 0
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            digits = np.frombuffer(chunk.translate(None, b' \t\r\n'), dtype=np.uint8) - ord('0')
+            if digits.size and digits.max() > 1:
+                raise ValueError("真值向量只能包含0和1")
+            bits = np.concatenate([pending, digits])
+            usable = bits.size - bits.size % 8
+            dst.write(np.packbits(bits[:usable]).tobytes())
+            pending = bits[usable:]
+            count += usable
+        count += pending.size
+    if count != 2 ** n or pending.size:
+        raise ValueError(f"变元个数为{n}, 真值向量长度应为{2 ** n}, 但得到的是{count}")
+    return n
+
+
+def hex_to_packed(hex_file, packed_file, chunk_size=1 << 24):
+    """把十六进制文本格式的真值表流式转换为打包格式"""
+    with open(hex_file, 'rb') as src, open(packed_file, 'wb') as dst:
+        pending = b''
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            digits = pending + chunk.translate(None, b' \t\r\n')
+            usable = len(digits) - len(digits) % 2
+            dst.write(bytes.fromhex(digits[:usable].decode('ascii')))
+            pending = digits[usable:]
+    if pending:
+        raise ValueError("十六进制数字个数必须为偶数")
+
+
+def load_packed_truth_table(packed_file):
+    """以内存映射方式打开打包真值表, 返回 (n, uint8 memmap)"""
+    size = os.path.getsize(packed_file)
+    if size == 0 or size & (size - 1):
+        raise ValueError(f"打包真值表的长度必须是2的幂个字节, 但得到的是{size}")
+    n = (size * 8).bit_length() - 1
+    return n, np.memmap(packed_file, dtype=np.uint8, mode='r')
+
+
+def walsh_spectrum_out_of_core(packed_file, spectrum_file, block_bits=20, group_bits=4, dtype=None):
+    """
+    对内存映射的打包真值表做分块快速Walsh-Hadamard变换, 谱写入磁盘上的 memmap 文件
+
+    结果与 compute_walsh_spectrum 相同(1 记为 1, 0 记为 -1). 内存占用约为 2^block_bits 个元素:
+    第一遍按块读入真值表, 完成块内(跨度小于块长)的各层蝶形运算;
+    之后每 group_bits 层合并为一遍, 跨度 h 到 h·2^(group_bits-1) 的各层只涉及 i + t·h (t < 2^group_bits)
+    这些位置, 每次取出 2^group_bits 行、若干列的子块在内存中做长度 2^group_bits 的变换再写回.
+
+    dtype 默认 n ≤ 30 时为 int32(谱值绝对值不超过 2^n), 更大时为 int64.
+    返回以 r+ 方式打开的谱 memmap.
+    """
+    n, table = load_packed_truth_table(packed_file)
+    N = 1 << n
+    if dtype is None:
+        dtype = np.int32 if n <= 30 else np.int64
+    block = 1 << min(block_bits, n)
+    if block < 8:
+        raise ValueError("块长至少为8")
+    spectrum = np.memmap(spectrum_file, dtype=dtype, mode='w+', shape=(N,))
+
+    # 第一遍: 解包并完成块内的各层
+    for start in range(0, N, block):
+        bits = np.unpackbits(table[start // 8:(start + block) // 8])
+        values = bits.astype(dtype) * 2 - 1
+        spectrum[start:start + block] = fast_walsh_hadamard_transform(values)
+
+    # 之后每遍处理 group_bits 层
+    level = block.bit_length() - 1
+    while level < n:
+        stages = min(group_bits, n - level)
+        rows, span = 1 << stages, 1 << level
+        view = spectrum.reshape(N // (rows * span), rows, span)
+        columns = max(block // rows, 1)
+        for outer in range(view.shape[0]):
+            for col in range(0, span, columns):
+                sub = np.ascontiguousarray(view[outer, :, col:col + columns].T)
+                view[outer, :, col:col + columns] = fast_walsh_hadamard_transform(sub).T
+        level += stages
+
+    spectrum.flush()
+    return spectrum
+
+
+def spectrum_summary(spectrum, block=1 << 22):
+    """分块扫描谱, 返回 (max|W(w)|, 是否平衡, 非线性度)"""
+    N = spectrum.shape[0]
+    max_abs = 0
+    for start in range(0, N, block):
+        max_abs = max(max_abs, int(np.abs(spectrum[start:start + block].astype(np.int64)).max()))
+    return max_abs, int(spectrum[0]) == 0, N // 2 - max_abs // 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大变元布尔函数的外存Walsh谱计算")
+    parser.add_argument("input", help="真值表文件(默认打包二进制格式)")
+    parser.add_argument("-o", "--output", required=True, help="谱输出文件(原始整数数组)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--hex", action="store_true", help="输入为十六进制文本格式")
+    group.add_argument("--config", action="store_true", help="输入为原有的文本配置文件格式")
+    parser.add_argument("--block-bits", type=int, default=20, help="内存中一块的元素个数取 2^block_bits")
+    args = parser.parse_args()
+
+    packed_file, temporary = args.input, None
+    if args.hex or args.config:
+        # 文本输入先转换为输出目录中的临时打包文件, 算完谱后删除
+        fd, temporary = tempfile.mkstemp(suffix=".packed", dir=os.path.dirname(os.path.abspath(args.output)))
+        os.close(fd)
+        packed_file = temporary
+    try:
+        if args.hex:
+            hex_to_packed(args.input, packed_file)
+        elif args.config:
+            pack_config_file(args.input, packed_file)
+        spectrum = walsh_spectrum_out_of_core(packed_file, args.output, args.block_bits)
+    finally:
+        if temporary is not None:
+            os.remove(temporary)
+
+    n = spectrum.shape[0].bit_length() - 1
+    max_abs, balanced, nonlinearity = spectrum_summary(spectrum)
+    print(f"变元个数: {n}")
+    print(f"谱文件: {args.output} ({spectrum.dtype}, {spectrum.shape[0]} 项)")
+    print(f"最大谱值绝对值: {max_abs}")
+    print(f"平衡: {'是' if balanced else '否'}")
+    print(f"非线性度: {nonlinearity}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from functools import cached_property
+
 import numpy as np
 
 
@@ -9,15 +11,74 @@ def read_boolean_function_config(config_file):
     # 解析变元个数
     n = int(lines[0].strip())
 
-    # 解析真值向量（允许有空格或没有空格）
+    # 解析真值向量（允许有空格或没有空格）, 整行按字节一次性转换为 0/1 数组
     truth_vector_str = lines[1].strip().replace(" ", "")
-    truth_vector = [int(c) for c in truth_vector_str]
+    truth_vector = np.frombuffer(truth_vector_str.encode('ascii'), dtype=np.uint8) - ord('0')
+    if truth_vector.size and truth_vector.max() > 1:
+        raise ValueError("真值向量只能包含0和1")
 
     return n, truth_vector
 
 
+def fast_walsh_hadamard_transform(values):
+    """
+    原地快速Walsh-Hadamard变换(沿最后一维, 长度须为2的幂), 复杂度 O(n·2^n)
+
+    第h层蝶形运算把数组看成 (..., 2^n/2h, 2, h) 的视图, 一次向量运算完成该层所有 (u, v) -> (u+v, u-v).
+    values 必须是C连续的NumPy数组, 也可以是二维数组(每行一个函数), 返回 values 本身.
+    """
+    N = values.shape[-1]
+    if N & (N - 1):
+        raise ValueError(f"变换长度必须是2的幂, 但得到的是{N}")
+    if not values.flags.c_contiguous:
+        raise ValueError("数组必须是C连续的")
+    h = 1
+    while h < N:
+        view = values.reshape(values.shape[:-1] + (N // (2 * h), 2, h))
+        u = view[..., 0, :]
+        v = view[..., 1, :]
+        total = u + v
+        np.subtract(u, v, out=v)
+        u[...] = total
+        h *= 2
+    return values
+
+
+def fast_mobius_transform(values):
+    """
+    原地快速Möbius变换(GF(2)上, 沿最后一维), 复杂度 O(n·2^n)
+
+    真值表变换后得到代数正规型系数, 代数正规型再变换一次又回到真值表(该变换是对合).
+    """
+    N = values.shape[-1]
+    if N & (N - 1):
+        raise ValueError(f"变换长度必须是2的幂, 但得到的是{N}")
+    if not values.flags.c_contiguous:
+        raise ValueError("数组必须是C连续的")
+    h = 1
+    while h < N:
+        view = values.reshape(values.shape[:-1] + (N // (2 * h), 2, h))
+        view[..., 1, :] ^= view[..., 0, :]
+        h *= 2
+    return values
+
+
 def compute_walsh_spectrum(n, truth_vector):
-    """计算布尔函数的Walsh谱"""
+    """
+    计算布尔函数的Walsh谱(快速Walsh-Hadamard变换, O(n·2^n))
+
+    结果与 compute_walsh_spectrum_reference 完全相同: spectrum[w] = Σ_x (-1)^(x·w) * f(x),
+    其中 f(x) 把函数值 1 记为 1、0 记为 -1.
+    """
+    truth_vector = np.asarray(truth_vector)
+    if truth_vector.shape != (2 ** n,):
+        raise ValueError(f"变元个数为{n}, 真值向量长度应为{2 ** n}, 但得到的是{truth_vector.size}")
+    spectrum = np.where(truth_vector == 1, 1, -1).astype(int)
+    return fast_walsh_hadamard_transform(spectrum)
+
+
+def compute_walsh_spectrum_reference(n, truth_vector):
+    """按定义逐项计算布尔函数的Walsh谱(O(n·4^n), 仅作为验证快速算法的参考实现)"""
     N = 2 ** n
     spectrum = np.zeros(N, dtype=int)
 
@@ -39,6 +100,77 @@ def compute_walsh_spectrum(n, truth_vector):
     return spectrum
 
 
+class BooleanFunction:
+    """
+    布尔函数的各种谱分析, 每种变换结果只计算一次并缓存
+
+    自相关谱由Walsh谱平方后再做一次变换得到, 同时需要两者时Walsh谱不会重复计算.
+    """
+
+    def __init__(self, n, truth_vector):
+        truth_vector = np.asarray(truth_vector, dtype=np.uint8)
+        if truth_vector.shape != (2 ** n,):
+            raise ValueError(f"变元个数为{n}, 真值向量长度应为{2 ** n}, 但得到的是{truth_vector.size}")
+        self.n = n
+        self.truth_vector = truth_vector
+
+    @cached_property
+    def walsh_spectrum(self):
+        """Walsh谱, 与 compute_walsh_spectrum 相同"""
+        return compute_walsh_spectrum(self.n, self.truth_vector)
+
+    @cached_property
+    def algebraic_normal_form(self):
+        """代数正规型系数: anf[u] = 1 表示单项式 Π_(u的第k位为1) x_(k+1) 出现"""
+        return fast_mobius_transform(self.truth_vector.copy())
+
+    @cached_property
+    def algebraic_degree(self):
+        """代数次数: 系数非零的单项式的最大次数(零函数记为0)"""
+        weights = np.array([bin(u).count('1') for u in range(2 ** self.n)])
+        monomials = weights[self.algebraic_normal_form == 1]
+        return int(monomials.max()) if monomials.size else 0
+
+    @cached_property
+    def autocorrelation_spectrum(self):
+        """
+        自相关谱 r(d) = Σ_x (-1)^(f(x) ⊕ f(x⊕d))
+
+        由 r(d) = 2^(-n) Σ_w W(w)² (-1)^(w·d) 计算, 即对Walsh谱的平方再做一次变换.
+        变换中间值的绝对值不超过 Σ W(w)² = 2^(2n), int64 足够.
+        """
+        squared = self.walsh_spectrum.astype(np.int64) ** 2
+        return fast_walsh_hadamard_transform(squared) >> self.n
+
+    @cached_property
+    def absolute_indicator(self):
+        """绝对值指标: max |r(d)|, d ≠ 0"""
+        return int(np.abs(self.autocorrelation_spectrum[1:]).max()) if self.n else 0
+
+    def anf_to_str(self):
+        """代数正规型的多项式形式, 如 1 + x1 + x1x2"""
+        terms = []
+        for u in np.flatnonzero(self.algebraic_normal_form):
+            u = int(u)
+            terms.append(''.join(f"x{k + 1}" for k in range(self.n) if u >> k & 1) or "1")
+        return " + ".join(terms) or "0"
+
+
+def compute_algebraic_normal_form(n, truth_vector):
+    """计算布尔函数的代数正规型系数(快速Möbius变换)"""
+    return BooleanFunction(n, truth_vector).algebraic_normal_form
+
+
+def compute_algebraic_degree(n, truth_vector):
+    """计算布尔函数的代数次数"""
+    return BooleanFunction(n, truth_vector).algebraic_degree
+
+
+def compute_autocorrelation_spectrum(n, truth_vector):
+    """计算布尔函数的自相关谱"""
+    return BooleanFunction(n, truth_vector).autocorrelation_spectrum
+
+
 def main():
     config_file = input("请输入配置文件路径: ")
     n, truth_vector = read_boolean_function_config(config_file)
@@ -48,7 +180,8 @@ def main():
         print(f"错误: 变元个数为{n}, 真值向量长度应为{2 ** n}, 但得到的是{len(truth_vector)}")
         return
 
-    spectrum = compute_walsh_spectrum(n, truth_vector)
+    function = BooleanFunction(n, truth_vector)
+    spectrum = function.walsh_spectrum
 
     print("\n布尔函数信息:")
     print(f"变元个数: {n}")
@@ -60,6 +193,15 @@ def main():
         binary_str = format(w, f'0{n}b')
         print(f"w = {binary_str}: {spectrum[w]}")
 
+    print(f"\n代数正规型: {function.anf_to_str()}")
+    print(f"代数次数: {function.algebraic_degree}")
+
+    autocorrelation = function.autocorrelation_spectrum
+    print("\n自相关谱值:")
+    for d in range(len(autocorrelation)):
+        print(f"d = {format(d, f'0{n}b')}: {autocorrelation[d]}")
+    print(f"绝对值指标: {function.absolute_indicator}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,263 @@
+import argparse
+import math
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from typing import Optional
+
+from 小参数离散对数求解Shanks import baby_step_giant_step, pohlig_hellman
+
+# 随机游走的分支数(r-adding walk), 按 y mod RHO_BRANCHES 选择乘数
+RHO_BRANCHES = 31
+
+# 子群的素数阶不超过该值时直接用BSGS(表只有 √q 项)
+PARALLEL_THRESHOLD = 1 << 32
+
+# 每个任务大约走的步数, 决定结果回传给协调进程的频率
+TASK_STEPS = 1 << 17
+
+
+def _default_dp_bits(bits: int, walks: int) -> int:
+    """
+    可区分点的位数: 低 dp_bits 位为0的元素是可区分点
+
+    总步数约为 2^(bits/2), 取 2^dp_bits 为其 1/(64·walks) 左右,
+    使碰撞之后平均只需再走很少的步数就能在可区分点上发现它, 而可区分点表也不会太大.
+    """
+    return max(0, bits // 2 - 6 - walks.bit_length())
+
+
+def _rho_task(g: int, h: int, p: int, q: int, multipliers, dp_mask: int, walks: int, seed: int):
+    """
+    工作进程: 从随机起点 g^a·h^b 出发走 walks 条 r-adding 随机游走, 每条走到可区分点为止
+
+    游走长度超过 20·2^dp_bits 仍未遇到可区分点时认为陷入了不含可区分点的圈, 丢弃这条游走.
+    返回 (可区分点列表 [(y, a, b)], 总步数).
+    """
+    rng = random.Random(seed)
+    r = len(multipliers)
+    max_length = 20 * (dp_mask + 1)
+    points, steps = [], 0
+    for _ in range(walks):
+        a, b = rng.randrange(q), rng.randrange(q)
+        y = pow(g, a, p) * pow(h, b, p) % p
+        for length in range(max_length):
+            if y & dp_mask == 0:
+                points.append((y, a % q, b % q))
+                break
+            m, c, d = multipliers[y % r]
+            y = y * m % p
+            a += c
+            b += d
+        steps += length + 1
+    return points, steps
+
+
+def parallel_rho_prime_order(g: int, h: int, p: int, q: int, workers: Optional[int] = None,
+                             dp_bits: Optional[int] = None, max_steps: Optional[int] = None) -> Optional[int]:
+    """
+    并行Pollard rho(van Oorschot-Wiener可区分点方法)求 g^x ≡ h mod p, g 的阶为素数 q
+
+    各工作进程独立地做随机游走, 只把可区分点 (y, a, b)(y = g^a·h^b)交给协调进程;
+    协调进程保存可区分点表, 两条游走到达同一可区分点且 b 不同时
+    x = (a1-a2)/(b2-b1) mod q. 内存只与可区分点个数有关, 速度随进程数近似线性增长.
+    h 不在 g 生成的子群中时返回None.
+    参数:
+        max_steps (int): 总步数上限, 默认约为期望步数 √(πq/2) 的40倍; 用完仍未找到解时抛出 ValueError
+    """
+    h %= p
+    if g % p == 1 or pow(g, q, p) != 1:
+        raise ValueError("g 的阶必须是素数 q")
+    if pow(h, q, p) != 1:
+        return None
+    if h == 1:
+        return 0
+
+    workers = workers or os.cpu_count()
+    if dp_bits is None:
+        dp_bits = _default_dp_bits(q.bit_length(), workers)
+    dp_mask = (1 << dp_bits) - 1
+    walks = max(1, TASK_STEPS >> dp_bits)
+    if max_steps is None:
+        max_steps = 32 * math.isqrt(q) + 8 * workers * walks * (dp_mask + 1)
+
+    rng = random.Random()
+    multipliers = []
+    for _ in range(RHO_BRANCHES):
+        c, d = rng.randrange(q), rng.randrange(q)
+        multipliers.append((pow(g, c, p) * pow(h, d, p) % p, c, d))
+
+    points, total = {}, 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        submit = partial(executor.submit, _rho_task, g, h, p, q, multipliers, dp_mask, walks)
+        pending = {submit(rng.getrandbits(64)) for _ in range(2 * workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, steps = future.result()
+                total += steps
+                for y, a, b in found:
+                    if y not in points:
+                        points[y] = (a, b)
+                        continue
+                    a2, b2 = points[y]
+                    if (b - b2) % q:
+                        x = (a2 - a) * pow(b - b2, -1, q) % q
+                        if pow(g, x, p) == h:
+                            for other in pending:
+                                other.cancel()
+                            return x
+                if total < max_steps:
+                    pending.add(submit(rng.getrandbits(64)))
+    raise ValueError(f"Pollard rho 走了 {total} 步仍未找到碰撞")
+
+
+def pollard_rho(g: int, h: int, p: int, workers: Optional[int] = None) -> Optional[int]:
+    """
+    常数内存的离散对数求解 g^x ≡ h mod p, 接口与 shanks_algorithm 相同
+
+    用Pohlig-Hellman把问题化为素数阶子群中的对数, 阶较小的子问题用BSGS,
+    较大的用并行Pollard rho.
+    """
+    def solver(g, h, p, q):
+        if q <= PARALLEL_THRESHOLD:
+            return baby_step_giant_step(g, h, p, order=q)
+        return parallel_rho_prime_order(g, h, p, q, workers)
+
+    if g % p == 1:
+        return 0 if h % p == 1 else None
+    return pohlig_hellman(g, h, p, solver=solver)
+
+
+def _kangaroo_task(p: int, jumps, dp_mask: int, herd):
+    """
+    工作进程: 每只袋鼠(编号, 当前元素, 已走距离)至少跳一步, 跳到可区分点为止
+
+    跳了 20·2^dp_bits 步仍未遇到可区分点时认为陷入了不含可区分点的圈(g 生成的子群很小时会发生),
+    这只袋鼠的 y 记为None, 由协调进程换随机起点重新出发.
+    返回 (袋鼠列表 [(编号, y, 距离)], 总步数).
+    """
+    r = len(jumps)
+    max_length = 20 * (dp_mask + 1)
+    arrived, steps = [], 0
+    for index, y, distance in herd:
+        for length in range(max_length):
+            m, s = jumps[y % r]
+            y = y * m % p
+            distance += s
+            if y & dp_mask == 0:
+                break
+        else:
+            y = None
+        steps += length + 1
+        arrived.append((index, y, distance))
+    return arrived, steps
+
+
+def parallel_kangaroo(g: int, h: int, p: int, lower: int = 0, upper: Optional[int] = None,
+                      workers: Optional[int] = None, dp_bits: Optional[int] = None) -> Optional[int]:
+    """
+    并行Pollard kangaroo(lambda)算法求 lower ≤ x ≤ upper 且 g^x ≡ h mod p, 接口与 shanks_algorithm 相同
+
+    驯服袋鼠从区间中部附近的已知指数 g^t 出发, 野袋鼠从 h·g^d 出发, 所有袋鼠按 y 选择跳跃步长;
+    驯服袋鼠与野袋鼠落在同一可区分点时 x = t - d. 同类袋鼠相撞后路径重合, 后到的一只换随机起点重新出发.
+    期望总步数约 2√(upper-lower), 与进程数成反比; 超过约8倍期望步数仍未找到时返回None.
+    参数:
+        upper (int): 区间上界, 默认 p-2
+        dp_bits (int): 可区分点的位数, 默认按区间宽度和袋鼠数确定
+    """
+    h %= p
+    if upper is None:
+        upper = p - 2
+    if h == 0 or lower > upper:
+        return None
+    width = upper - lower + 1
+    if width <= TASK_STEPS:
+        # 区间很小时直接用BSGS
+        x = baby_step_giant_step(g, h * pow(g, -lower, p) % p, p, order=width)
+        return None if x is None else lower + x
+
+    workers = workers or os.cpu_count()
+    groups = 2 * workers
+    kangaroos = 8 * groups
+    if dp_bits is None:
+        dp_bits = _default_dp_bits(width.bit_length(), kangaroos)
+    dp_mask = (1 << dp_bits) - 1
+    group_size = kangaroos // groups
+
+    rng = random.Random()
+    mean = max(1, kangaroos * math.isqrt(width) // 4)
+    jumps = []
+    for _ in range(RHO_BRANCHES):
+        s = rng.randint(1, 2 * mean)
+        jumps.append((pow(g, s, p), s))
+
+    def start(index):
+        # 偶数编号为驯服袋鼠(距离是绝对指数), 奇数编号为野袋鼠(距离是相对 x 的偏移)
+        offset = rng.randrange(width // 2 + 1)
+        if index % 2 == 0:
+            t = lower + width // 2 + offset
+            return index, pow(g, t, p), t
+        return index, h * pow(g, offset, p) % p, offset
+
+    herds = [[start(group * group_size + k) for k in range(group_size)] for group in range(groups)]
+    budget = 16 * math.isqrt(width) + kangaroos * (dp_mask + 1) * 4
+    points, total = {}, 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(_kangaroo_task, p, jumps, dp_mask, herd): herd for herd in herds}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                arrived, steps = future.result()
+                total += steps
+                herd = []
+                for index, y, distance in arrived:
+                    kind = index % 2
+                    if y is None:
+                        herd.append(start(index))
+                        continue
+                    if y in points:
+                        other_kind, other_distance = points[y]
+                        if other_kind != kind:
+                            tame, wild = (distance, other_distance) if kind == 0 else (other_distance, distance)
+                            x = tame - wild
+                            if lower <= x <= upper and pow(g, x, p) == h:
+                                for other in pending:
+                                    other.cancel()
+                                return x
+                        else:
+                            herd.append(start(index))
+                            continue
+                    else:
+                        points[y] = (kind, distance)
+                    herd.append((index, y, distance))
+                if total < budget:
+                    pending[executor.submit(_kangaroo_task, p, jumps, dp_mask, herd)] = herd
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并行Pollard rho / kangaroo 离散对数求解")
+    parser.add_argument("g", type=int)
+    parser.add_argument("h", type=int)
+    parser.add_argument("p", type=int)
+    parser.add_argument("--kangaroo", nargs=2, type=int, metavar=("LOWER", "UPPER"),
+                        help="已知 x 所在区间时用kangaroo算法")
+    parser.add_argument("--workers", type=int, help="工作进程数(默认CPU核数)")
+    args = parser.parse_args()
+
+    print(f"求解 {args.g}^x ≡ {args.h} mod {args.p}")
+    if args.kangaroo:
+        x = parallel_kangaroo(args.g, args.h, args.p, *args.kangaroo, workers=args.workers)
+    else:
+        x = pollard_rho(args.g, args.h, args.p, workers=args.workers)
+    if x is None:
+        print("未找到解，离散对数不存在")
+    else:
+        print(f"解：x = {x}, 验证 {args.g}^{x} mod {args.p} = {pow(args.g, x, args.p)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from sympy import factorint, primerange
+
+from 小参数离散对数求解Shanks import _crt, _solve_prime_power, multiplicative_order
+
+# p-1 的素因子不超过该值时用Pohlig-Hellman(BSGS)求该部分, 更大的素因子用指数演算
+SMALL_FACTOR_BOUND = 1 << 32
+
+# 每个关系收集任务检查的候选个数
+CANDIDATES_PER_TASK = 4096
+
+
+def default_factor_base_bound(p: int) -> int:
+    """因子基上界的经验取值: 约 4·L_p[1/2, 1/2], 限制在 1000 到 2^15 之间"""
+    log_p = math.log(p)
+    bound = 4 * math.exp(0.5 * math.sqrt(log_p * math.log(log_p)))
+    return int(min(max(bound, 1000), 1 << 15))
+
+
+def _rational_reconstruction(r: int, p: int):
+    """把 r 写成 a/b mod p, |a|, |b| 约不超过 √p(扩展欧几里得算法中途停止), 返回 (a, b)"""
+    r0, r1 = p, r
+    t0, t1 = 0, 1
+    bound = math.isqrt(p)
+    while r1 > bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        t0, t1 = t1, t0 - q * t1
+    return r1, t1
+
+
+def _remainders(P: int, numbers: List[int]) -> List[int]:
+    """余数树: 先自底向上建乘积树, 再自顶向下求 P mod n_i, 一批数只需对 P 做一次大除法"""
+    tree = [numbers]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)])
+    remainders = [P % tree[-1][0]]
+    for level in reversed(tree[:-1]):
+        remainders = [remainders[i // 2] % n for i, n in enumerate(level)]
+    return remainders
+
+
+def _smooth_flags(P: int, numbers: List[int]) -> List[bool]:
+    """
+    批量判断光滑性(Bernstein): n 的素因子都在因子基中, 当且仅当 (P mod n)^(2^e) ≡ 0 mod n,
+    其中 P 为因子基素数之积, 2^e 不小于 n 的位数
+    """
+    flags = []
+    for n, z in zip(numbers, _remainders(P, numbers)):
+        for _ in range(n.bit_length().bit_length()):
+            z = z * z % n
+        flags.append(z == 0)
+    return flags
+
+
+def _factor_over(n: int, primes: List[int], exponents: Dict[int, int], sign: int):
+    """用因子基试除光滑数 n, 把各素数的指数(乘以 sign)累加到 exponents 中"""
+    for index, q in enumerate(primes):
+        if n == 1:
+            break
+        while n % q == 0:
+            n //= q
+            exponents[index] = exponents.get(index, 0) + sign
+
+
+def _collect_relations(p: int, g: int, primes: List[int], P: int, count: int, seed: int):
+    """
+    工作进程: 检查 count 个随机 g^k mod p, 返回其中的关系
+
+    g^k ≡ a/b mod p 且 a, b 都在因子基上光滑时得到关系
+    k ≡ Σ e_i·log q_i - Σ f_i·log q_i (+ log(-1)) mod p-1, 记为 (k, 是否含-1, {素数下标: 指数}).
+    """
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(count):
+        k = rng.randrange(1, p - 1)
+        a, b = _rational_reconstruction(pow(g, k, p), p)
+        if a:
+            candidates.append((k, a, b))
+    numbers = [a for _, a, _ in candidates] + [abs(b) for _, _, b in candidates]
+    flags = _smooth_flags(P, numbers)
+    relations = []
+    for i, (k, a, b) in enumerate(candidates):
+        if flags[i] and flags[len(candidates) + i]:
+            exponents = {}
+            _factor_over(a, primes, exponents, 1)
+            _factor_over(abs(b), primes, exponents, -1)
+            relations.append((k, b < 0, {i: e for i, e in exponents.items() if e}))
+    return relations
+
+
+def _structured_elimination(rows, rhs, ell, excess):
+    """
+    结构化高斯消元的剪枝阶段
+
+    反复删去只出现在一个关系中的列(连同该关系, 记入回代栈), 关系过多时删去最重的关系,
+    直到剩下的核心方程组的关系数不超过列数 + excess.
+    返回 (核心关系下标列表, 回代栈 [(关系下标, 列)]).
+    """
+    counts = {}
+    for row in rows:
+        for c in row:
+            counts[c] = counts.get(c, 0) + 1
+    alive = set(range(len(rows)))
+    stack = []
+
+    def remove(r):
+        alive.discard(r)
+        for c in rows[r]:
+            counts[c] -= 1
+
+    changed = True
+    while changed:
+        changed = False
+        singletons = {c for c, n in counts.items() if n == 1}
+        for r in list(alive):
+            hit = [c for c in rows[r] if c in singletons]
+            if hit:
+                stack.append((r, hit[0]))
+                remove(r)
+                changed = True
+        columns = sum(1 for n in counts.values() if n > 0)
+        surplus = len(alive) - columns - excess
+        if surplus > 0:
+            for r in sorted(alive, key=lambda r: len(rows[r]), reverse=True)[:surplus]:
+                remove(r)
+            changed = True
+    return sorted(alive), stack
+
+
+def _lanczos(rows, rhs, columns, ell, rng):
+    """
+    Lanczos算法解 GF(ℓ) 上的稀疏方程组 B·x = rhs(在正规方程 BᵀDB·x = BᵀD·rhs 上迭代, D为随机对角阵)
+
+    rows 为稀疏行 [{列: 系数}], 列已重新编号为 0..columns-1. 失败(遇到自正交向量)时返回None.
+    """
+    scale = [rng.randrange(1, ell) for _ in rows]
+
+    def transpose_apply(y):
+        out = [0] * columns
+        for row, value in zip(rows, y):
+            for c, e in row.items():
+                out[c] += e * value
+        return [v % ell for v in out]
+
+    def apply(x):
+        y = [d * sum(e * x[c] for c, e in row.items()) % ell for row, d in zip(rows, scale)]
+        return transpose_apply(y)
+
+    def dot(u, v):
+        return sum(a * b for a, b in zip(u, v)) % ell
+
+    b = transpose_apply([d * r % ell for d, r in zip(scale, rhs)])
+    x = [0] * columns
+    w, w_prev, v_prev, wv_prev = b, None, None, None
+    for _ in range(columns + 2):
+        if not any(w):
+            break
+        v = apply(w)
+        wv = dot(w, v)
+        if wv == 0:
+            return None
+        inverse = pow(wv, -1, ell)
+        t = dot(w, b) * inverse % ell
+        x = [(xi + t * wi) % ell for xi, wi in zip(x, w)]
+        c1 = dot(v, v) * inverse % ell
+        next_w = [(vi - c1 * wi) % ell for vi, wi in zip(v, w)]
+        if w_prev is not None:
+            c2 = dot(v, v_prev) * pow(wv_prev, -1, ell) % ell
+            next_w = [(ni - c2 * wi) % ell for ni, wi in zip(next_w, w_prev)]
+        w_prev, v_prev, wv_prev, w = w, v, wv, next_w
+    return x if apply(x) == b else None
+
+
+class IndexCalculus:
+    """
+    模 p 乘法群上的指数演算离散对数求解器, g 必须是模 p 的原根
+
+    p-1 的小素因子部分用Pohlig-Hellman求解; 每个大素因子 ℓ 上:
+    1. 关系收集: 随机 g^k 经有理重构写成 a/b, 用乘积树批量判断 a, b 的光滑性, 在进程池中并行;
+    2. 线性代数: 结构化消元剪枝后, 用Lanczos算法求因子基中各素数的对数 mod ℓ, 再回代被剪去的列;
+    3. 单个对数: 找 s 使 h·g^s 在因子基上光滑, 由因子基的对数直接算出.
+    因子基的对数在 cache_dir 中按 (p, g, 因子基上界) 保存, 之后的求解只需第3步.
+    """
+
+    def __init__(self, p: int, g: int, bound: Optional[int] = None, cache_dir: Optional[str] = None,
+                 workers: Optional[int] = None, factorization: Optional[Dict[int, int]] = None):
+        """
+        参数:
+            p (int): 素数模数
+            g (int): 模 p 的原根
+            bound (int): 因子基上界, 默认由 default_factor_base_bound 确定
+            cache_dir (str): 因子基对数的缓存目录, 为None时不缓存
+            workers (int): 关系收集的工作进程数, 默认CPU核数, 为1时不启动进程池
+            factorization (dict): 已知的 p-1 分解 {素数: 指数}
+        """
+        self.p = p
+        self.g = g % p
+        self.factorization = factorization or factorint(p - 1)
+        if multiplicative_order(self.g, p, self.factorization) != p - 1:
+            raise ValueError(f"{g} 不是模 {p} 的原根")
+        self.large_factors = sorted(q for q in self.factorization if q > SMALL_FACTOR_BOUND)
+        for q in self.large_factors:
+            if self.factorization[q] > 1:
+                raise ValueError(f"p-1 含有大素因子的高次幂 {q}^{self.factorization[q]}, 暂不支持")
+        self.bound = bound or default_factor_base_bound(p)
+        self.primes = list(primerange(2, self.bound + 1))
+        self.workers = workers or os.cpu_count()
+        self.cache_dir = cache_dir
+        self.logs: Dict[int, Dict[int, int]] = {}
+        self._rng = random.Random()
+
+    def _cache_path(self):
+        key = hashlib.sha256(f"{self.p},{self.g},{self.bound}".encode()).hexdigest()[:24]
+        return os.path.join(self.cache_dir, f"index_calculus_{key}.json")
+
+    def precompute(self):
+        """求因子基中各素数模每个大素因子 ℓ 的对数(有缓存时直接读取)"""
+        if self.logs or not self.large_factors:
+            return
+        if self.cache_dir and os.path.exists(self._cache_path()):
+            with open(self._cache_path(), 'r') as f:
+                data = json.load(f)
+            self.logs = {int(ell): {int(q): L for q, L in logs.items()} for ell, logs in data['logs'].items()}
+            return
+
+        target = len(self.primes) + max(20, len(self.primes) // 10)
+        relations = []
+        while True:
+            relations += self.collect_relations(target - len(relations))
+            logs = {ell: self._solve_linear_system(relations, ell) for ell in self.large_factors}
+            # 每个 ℓ 都至少解出 2 的对数, 且大部分小素数已解出时才够用
+            if all(len(logs[ell]) >= len(self.primes) // 2 and 2 in logs[ell] for ell in logs):
+                break
+            target = len(relations) + max(20, len(self.primes) // 10)
+        self.logs = logs
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data = {'p': self.p, 'g': self.g, 'bound': self.bound,
+                    'logs': {str(ell): {str(q): L for q, L in logs.items()} for ell, logs in self.logs.items()}}
+            temporary = f"{self._cache_path()}.{os.getpid()}.tmp"
+            with open(temporary, 'w') as f:
+                json.dump(data, f)
+            os.replace(temporary, self._cache_path())
+
+    def collect_relations(self, count: int):
+        """收集至少 count 个关系, workers > 1 时在进程池中并行, 同时在途的任务不超过工作进程数的两倍"""
+        P = math.prod(self.primes)
+        args = (self.p, self.g, self.primes, P, CANDIDATES_PER_TASK)
+        relations = []
+        if self.workers == 1:
+            while len(relations) < count:
+                relations += _collect_relations(*args, self._rng.getrandbits(64))
+            return relations
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque(executor.submit(_collect_relations, *args, self._rng.getrandbits(64))
+                            for _ in range(2 * self.workers))
+            while len(relations) < count:
+                relations += pending.popleft().result()
+                pending.append(executor.submit(_collect_relations, *args, self._rng.getrandbits(64)))
+            for future in pending:
+                future.cancel()
+        return relations
+
+    def _solve_linear_system(self, relations, ell):
+        """由关系求因子基素数的对数 mod ℓ, 返回 {素数: 对数}, 只包含经过验证的素数"""
+        half = (self.p - 1) // 2
+        rows = [{c: e % ell for c, e in exponents.items()} for _, _, exponents in relations]
+        rhs = [(k - (half if negative else 0)) % ell for k, negative, _ in relations]
+        core, stack = _structured_elimination(rows, rhs, ell, excess=max(10, len(self.primes) // 50))
+
+        columns = sorted({c for r in core for c in rows[r]})
+        index = {c: i for i, c in enumerate(columns)}
+        core_rows = [{index[c]: e for c, e in rows[r].items()} for r in core]
+        solution = None
+        for _ in range(3):
+            solution = _lanczos(core_rows, [rhs[r] for r in core], len(columns), ell, self._rng)
+            if solution is not None:
+                break
+        known = {} if solution is None else {c: solution[i] for c, i in index.items()}
+
+        # 回代: 被剪去的关系按相反顺序恢复各自的那一列
+        for r, c in reversed(stack):
+            others = [(c2, e) for c2, e in rows[r].items() if c2 != c]
+            if all(c2 in known for c2, _ in others):
+                value = rhs[r] - sum(e * known[c2] for c2, e in others)
+                known[c] = value * pow(rows[r][c], -1, ell) % ell
+
+        # 验证: q^((p-1)/ℓ) = γ^L, 其中 γ = g^((p-1)/ℓ) 的阶为 ℓ
+        cofactor = (self.p - 1) // ell
+        gamma = pow(self.g, cofactor, self.p)
+        return {self.primes[c]: L for c, L in known.items()
+                if pow(self.primes[c], cofactor, self.p) == pow(gamma, L, self.p)}
+
+    def _log_mod_large(self, h: int) -> Dict[int, int]:
+        """找 s 使 h·g^s ≡ a/b 且 a, b 只含已解出对数的素数, 得到 log h mod 每个大素因子 ℓ"""
+        usable = sorted(set.intersection(*(set(logs) for logs in self.logs.values())))
+        P = math.prod(usable)
+        half = (self.p - 1) // 2
+        while True:
+            s = self._rng.randrange(self.p - 1)
+            a, b = _rational_reconstruction(h * pow(self.g, s, self.p) % self.p, self.p)
+            if not a or not all(_smooth_flags(P, [a, abs(b)])):
+                continue
+            exponents = {}
+            _factor_over(a, usable, exponents, 1)
+            _factor_over(abs(b), usable, exponents, -1)
+            result = {}
+            for ell, logs in self.logs.items():
+                total = sum(e * logs[usable[i]] for i, e in exponents.items()) - s + (half if b < 0 else 0)
+                result[ell] = total % ell
+            return result
+
+    def solve(self, h: int) -> Optional[int]:
+        """求 0 ≤ x < p-1 且 g^x ≡ h mod p 的x, h ≡ 0 时返回None"""
+        h %= self.p
+        if h == 0:
+            return None
+        residues, moduli = [], []
+        for q, e in self.factorization.items():
+            if q in self.large_factors:
+                continue
+            cofactor = (self.p - 1) // q ** e
+            residues.append(_solve_prime_power(pow(self.g, cofactor, self.p), pow(h, cofactor, self.p), self.p, q, e))
+            moduli.append(q ** e)
+        if self.large_factors:
+            self.precompute()
+            large = self._log_mod_large(h)
+            residues += [large[ell] for ell in self.large_factors]
+            moduli += self.large_factors
+        return _crt(residues, moduli)[0] % (self.p - 1)
+
+
+def index_calculus(g: int, h: int, p: int, bound: Optional[int] = None, cache_dir: Optional[str] = None,
+                   workers: Optional[int] = None) -> Optional[int]:
+    """指数演算求解 g^x ≡ h mod p(g 为原根), 接口与 shanks_algorithm 相同"""
+    return IndexCalculus(p, g, bound, cache_dir, workers).solve(h)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="指数演算离散对数求解(g 须为原根)")
+    parser.add_argument("g", type=int)
+    parser.add_argument("p", type=int)
+    parser.add_argument("h", type=int, nargs="+", help="一个或多个目标")
+    parser.add_argument("--bound", type=int, help="因子基上界")
+    parser.add_argument("--cache-dir", help="因子基对数缓存目录")
+    parser.add_argument("--workers", type=int, help="关系收集的工作进程数(默认CPU核数)")
+    args = parser.parse_args()
+
+    solver = IndexCalculus(args.p, args.g, args.bound, args.cache_dir, args.workers)
+    print(f"p = {args.p}, g = {args.g}, 因子基上界 {solver.bound}({len(solver.primes)} 个素数)")
+    for h in args.h:
+        x = solver.solve(h)
+        print(f"log_{args.g}({h}) = {x}, 验证 {args.g}^{x} mod {args.p} = {pow(args.g, x, args.p)}")
+
+
+if __name__ == "__main__":
+    main()